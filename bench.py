@@ -0,0 +1,697 @@
+#!/usr/bin/env python3
+"""Load benchmarks for the betting board server.
+
+Everything runs against a throwaway SQLite database seeded with synthetic
+entries, so the real data/superbowl.db is never touched.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import server
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley", "Morgan", "Jamie", "Drew", "Quinn", "Avery", "Parker"]
+LAST_NAMES = ["Smith", "Lee", "Garcia", "Nguyen", "Brown", "Lopez", "Kim", "Patel", "Clark", "Young", "King", "Hill"]
+
+
+def random_submission(rng, index):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+    answers = {}
+    for q in server.QUESTIONS:
+        if rng.random() < 0.15:
+            continue
+        if q["type"] == "numeric":
+            answers[str(q["id"])] = str(rng.randint(q["min"], min(q["max"], 80)))
+        else:
+            answers[str(q["id"])] = rng.choice(q["options"])
+    return {
+        "fullName": name,
+        "venmoHandle": f"@user{index}",
+        "phoneNumber": f"555{index:07d}",
+        "paymentMethod": rng.choice(["cash", "venmo"]),
+        "answers": answers,
+        "squareSelections": [],
+    }
+
+
+def seed_database(db_path, entries, seed=2026):
+    """Create a fresh database at db_path holding `entries` synthetic submissions."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    server.DB_PATH = db_path
+    server.init_db()
+    rng = random.Random(seed)
+    now = "2026-02-08T23:30:00Z"
+    free_squares = [(r, c) for r in range(10) for c in range(10)]
+    rng.shuffle(free_squares)
+    submissions, answers, squares = [], [], []
+    for index in range(entries):
+        submission_id = index + 1
+        data = random_submission(rng, index)
+        total = sum(q["cost"] for q in server.QUESTIONS if str(q["id"]) in data["answers"])
+        submissions.append(
+            (
+                submission_id,
+                data["fullName"],
+                data["venmoHandle"],
+                data["phoneNumber"],
+                server.phone_last4(data["phoneNumber"]),
+                data["paymentMethod"],
+                total,
+                now,
+            )
+        )
+        answers.extend((submission_id, int(qid), ans, server.answer_number(ans)) for qid, ans in data["answers"].items())
+        if free_squares and rng.random() < 0.3:
+            row, col = free_squares.pop()
+            squares.append((submission_id, row, col))
+    conn = server.connect_db(db_path)
+    conn.executemany(
+        """
+        INSERT INTO submissions(id, full_name, venmo_handle, phone_number, phone_last4, payment_method, total_owed, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        submissions,
+    )
+    conn.executemany("INSERT INTO answers(submission_id, question_id, answer_text, answer_num) VALUES (?, ?, ?, ?)", answers)
+    conn.executemany("INSERT INTO square_selections(submission_id, row_idx, col_idx) VALUES (?, ?, ?)", squares)
+    conn.commit()
+    conn.close()
+
+
+def use_database(db_path):
+    """Point the in-process server module at db_path and drop caches built from another file."""
+    server.DB_PATH = db_path
+    server.POOLS.reset()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "ops_per_sec": round(len(samples) / (sum(samples) / 1000), 1) if sum(samples) else 0.0,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path, port, extra_args=(), timeout=10):
+    # Every simulated client shares 127.0.0.1, so per-client rate limits would throttle the whole run.
+    proc = subprocess.Popen(
+        [
+            sys.executable, os.path.join(ROOT_DIR, "server.py"),
+            "--host", "127.0.0.1", "--port", str(port), "--db", db_path, "--no-rate-limit", *extra_args,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def request_body(kind, rng, index):
+    if kind == "submission":
+        return json.dumps(random_submission(rng, index)).encode("utf-8")
+    if kind == "view-guesses":
+        return json.dumps({"last4": f"{rng.randint(0, 9999):04d}"}).encode("utf-8")
+    return None
+
+
+def _client_loop(args):
+    port, method, path, body_kind, duration, threads, seed, think = args
+    import threading
+
+    paths = path if isinstance(path, list) else [path]
+
+    results = []
+
+    def run(worker):
+        rng = random.Random(seed * 1000 + worker)
+        latencies = []
+        errors = 0
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        headers = {"X-Admin-Password": server.ADMIN_PASSWORD, "Content-Type": "application/json"}
+        deadline = time.monotonic() + duration
+        index = 0
+        while time.monotonic() < deadline:
+            index += 1
+            body = request_body(body_kind, rng, 1_000_000 * (worker + 1) + index)
+            started = time.perf_counter()
+            try:
+                conn.request(method, rng.choice(paths), body=body, headers=headers)
+                res = conn.getresponse()
+                res.read()
+                if res.status in (200, 404):
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection; reconnect like a browser would.
+                conn.close()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+            if think:
+                time.sleep(think)
+        conn.close()
+        results.append((latencies, errors))
+
+    pool = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return [ms for r in results for ms in r[0]], sum(r[1] for r in results)
+
+
+def http_load(port, path, duration, clients, method="GET", body_kind=None, client_procs=4, seed=2026):
+    """Drive the server with `clients` keep-alive connections for `duration` seconds.
+
+    `path` may be a list, in which case every request picks one at random.
+    """
+    client_procs = max(1, min(client_procs, clients))
+    per_proc = max(1, clients // client_procs)
+    jobs = [(port, method, path, body_kind, duration, per_proc, seed + i, 0) for i in range(client_procs)]
+    with multiprocessing.Pool(client_procs) as pool:
+        started = time.monotonic()
+        results = pool.map(_client_loop, jobs)
+        elapsed = time.monotonic() - started
+    latencies = [ms for r in results for ms in r[0]]
+    return {
+        "requests": len(latencies),
+        "errors": sum(r[1] for r in results),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def bench_worker_scaling(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed_database(db_path, args.entries)
+        rows = []
+        for workers in args.workers:
+            port = free_port()
+            proc = start_server(db_path, port, ["--workers", str(workers)])
+            try:
+                result = http_load(port, args.path, args.duration, args.clients)
+            finally:
+                proc.terminate()
+                proc.wait()
+            result.update({"workers": workers, "clients": args.clients, "path": args.path, "entries": args.entries})
+            rows.append(result)
+            print(f"workers={workers:<3} rps={result['rps']:<8} p50={result['p50_ms']:<8} p99={result['p99_ms']:<8} errors={result['errors']}")
+        return rows
+
+
+def metric_value(port, name):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", "/api/admin/metrics", headers={"X-Admin-Password": server.ADMIN_PASSWORD})
+    text = conn.getresponse().read().decode("utf-8")
+    conn.close()
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    return 0.0
+
+
+def bench_write_modes(args):
+    """POST /api/submissions throughput with per-request commits versus the group-commit writer."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "writes.db")
+        for mode, extra in (("per-request", ["--no-group-commit"]), ("group", [])):
+            for clients in args.clients:
+                seed_database(db_path, args.entries)
+                port = free_port()
+                proc = start_server(db_path, port, ["--workers", str(args.workers), *extra])
+                try:
+                    result = http_load(port, "/api/submissions", args.duration, clients, method="POST", body_kind="submission")
+                    batches = metric_value(port, "superbowl_submission_batches_total")
+                    entries = metric_value(port, "superbowl_submission_batch_entries_total")
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                result.update({"mode": mode, "clients": clients, "avg_batch": round(entries / batches, 1) if batches else 1})
+                rows.append(result)
+                print(
+                    f"{mode:<12} clients={clients:<4} rps={result['rps']:<8} p50={result['p50_ms']:<8} "
+                    f"p99={result['p99_ms']:<8} batch={result['avg_batch']:<6} errors={result['errors']}"
+                )
+    return rows
+
+
+def bench_processes(args):
+    """Requests/second from one server process against prefork mode, on routes that spend their time in Python."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "processes.db")
+        seed_database(db_path, args.entries)
+        for processes in args.processes:
+            port = free_port()
+            extra = ["--workers", str(args.workers), "--processes", str(processes), "--backup-interval", "0"]
+            proc = start_server(db_path, port, extra, timeout=60)
+            try:
+                for path in args.paths:
+                    result = http_load(port, path, args.duration, args.clients)
+                    result.update({"processes": processes, "path": path, "entries": args.entries, "cpus": os.cpu_count()})
+                    rows.append(result)
+                    print(
+                        f"processes={processes:<3} {path:<20} rps={result['rps']:<8} p50={result['p50_ms']:<8} "
+                        f"p99={result['p99_ms']:<8} errors={result['errors']}"
+                    )
+            finally:
+                proc.terminate()
+                proc.wait()
+    return rows
+
+
+def bench_startup(args):
+    """Time from launch to the first /api/results response, from a full scan and from a warm-start snapshot."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            db_path = os.path.join(tmp, f"startup-{entries}.db")
+            seed_database(db_path, entries)
+            for mode in ("full scan", "snapshot"):
+                port = free_port()
+                started = time.perf_counter()
+                proc = start_server(db_path, port, ["--backup-interval", "0"], timeout=600)
+                try:
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                    conn.request("GET", "/api/results")
+                    conn.getresponse().read()
+                    conn.close()
+                    ready_ms = (time.perf_counter() - started) * 1000
+                finally:
+                    # SIGTERM makes the server write the snapshot the second launch starts from.
+                    proc.terminate()
+                    proc.wait()
+                rows.append({"entries": entries, "mode": mode, "ready_ms": round(ready_ms, 1)})
+                print(f"entries={entries:<7} {mode:<10} first /api/results after {ready_ms:.0f} ms")
+    return rows
+
+
+def bench_admin_state(args):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            db_path = os.path.join(tmp, f"admin-{entries}.db")
+            seed_database(db_path, entries)
+            use_database(db_path)
+            conn = server.get_db()
+            conn.execute("INSERT INTO correct_answers(question_id, answer_text) VALUES (1, '90'), (2, 'Patriots'), (19, '24')")
+            conn.commit()
+            started = time.perf_counter()
+            server.build_admin_payload(server.POOLS.default(), conn)
+            cold_ms = (time.perf_counter() - started) * 1000
+            result = time_calls(lambda: server.build_admin_payload(server.POOLS.default(), conn), args.repeat)
+            server.release_db(conn)
+            result.update({"entries": entries, "cold_ms": round(cold_ms, 3)})
+            rows.append(result)
+            print(f"entries={entries:<7} cold={result['cold_ms']:<10} p50={result['p50_ms']:<8} p99={result['p99_ms']} ms")
+    return rows
+
+
+def bench_ledger(args):
+    """An admin refresh after each saved answer: the full admin payload versus the summary plus one ledger page."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            db_path = os.path.join(tmp, f"ledger-{entries}.db")
+            seed_database(db_path, entries)
+            use_database(db_path)
+            pool = server.POOLS.default()
+            conn = server.get_db()
+            samples = {"full": [], "paged": []}
+            for step in range(args.repeat):
+                for flip, mode in enumerate(samples):
+                    # Flip the answer before every build so each one starts from a real change.
+                    answer = ("Patriots", "Seahawks")[flip]
+                    conn.execute("INSERT OR REPLACE INTO correct_answers(question_id, answer_text) VALUES (2, ?)", (answer,))
+                    conn.commit()
+                    pool.refresh(conn, local=True)
+                    started = time.perf_counter()
+                    if mode == "full":
+                        body = json.dumps(server.build_admin_payload(pool, conn))
+                    else:
+                        body = json.dumps(pool.ledger.summary(conn)) + json.dumps(pool.ledger.page(conn))
+                    samples[mode].append(((time.perf_counter() - started) * 1000, len(body)))
+            server.release_db(conn)
+            for mode, timings in samples.items():
+                row = {
+                    "entries": entries,
+                    "mode": mode,
+                    "p50_ms": round(percentile([ms for ms, _ in timings], 50), 3),
+                    "bytes": timings[-1][1],
+                }
+                rows.append(row)
+                print(f"entries={entries:<7} {mode:<6} p50={row['p50_ms']:<10} ms  {row['bytes']} bytes")
+    return rows
+
+
+def random_scenarios(rng, count):
+    """Outcome sets as the simulator takes them: a few answers and quarter scores each."""
+    scenarios = []
+    for index in range(count):
+        answers = {}
+        for q in rng.sample(server.QUESTIONS, 6):
+            answers[q["id"]] = rng.randint(q["min"], q["max"]) if q["type"] == "numeric" else rng.choice(q["options"])
+        scores = {f"q{quarter}": {"patriots": rng.randint(0, 35), "seahawks": rng.randint(0, 35)} for quarter in range(1, 5)}
+        scenarios.append({"label": f"scenario {index + 1}", "answers": answers, "scores": scores})
+    return scenarios
+
+
+def bench_simulate(args):
+    rows = []
+    rng = random.Random(args.seed)
+    scenarios = random_scenarios(rng, args.scenarios)
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            db_path = os.path.join(tmp, f"simulate-{entries}.db")
+            seed_database(db_path, entries)
+            use_database(db_path)
+            pool = server.POOLS.default()
+            conn = server.get_db()
+            conn.execute("INSERT INTO correct_answers(question_id, answer_text) VALUES (1, '90'), (2, 'Patriots'), (19, '24')")
+            conn.commit()
+            server.build_results(pool, conn)
+            people = list(pool.tallies.participant_ids)[: args.people]
+            started = time.perf_counter()
+            server.simulate_payouts(pool, conn, scenarios, people)
+            cold_ms = (time.perf_counter() - started) * 1000
+            result = time_calls(lambda: server.simulate_payouts(pool, conn, scenarios, people), args.repeat)
+            server.release_db(conn)
+            result.update({"entries": entries, "people": len(people), "scenarios": len(scenarios), "cold_ms": round(cold_ms, 3)})
+            rows.append(result)
+            print(
+                f"entries={entries:<7} people={len(people):<5} scenarios={len(scenarios):<5} "
+                f"cold={result['cold_ms']:<10} p50={result['p50_ms']:<8} p99={result['p99_ms']} ms"
+            )
+    return rows
+
+
+def bench_pool_isolation(args):
+    """Load the busiest pool while the others see light traffic, for a growing number of pools.
+
+    The default pool gets `--entries` seeded submissions and `--clients`
+    connections; every other pool holds `--pool-entries` submissions and is
+    browsed by `--background-clients` connections that pause between requests.
+    """
+    rows = []
+    for count in args.pools:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "bench.db")
+            seed_database(db_path, args.entries, seed=args.seed)
+            server.POOLS.init()
+            others = [f"pool-{i}" for i in range(1, count)]
+            for pool_id in others:
+                server.DB_PATH = db_path
+                server.POOLS.create(pool_id, pool_id, "bench")
+                seed_database(server.POOLS.path_for(pool_id), args.pool_entries, seed=args.seed)
+            server.DB_PATH = db_path
+            server.POOLS.reset()
+            port = free_port()
+            proc = start_server(db_path, port, ["--workers", str(args.workers)])
+            background = None
+            try:
+                other_paths = [f"/api/pools/{pool_id}/{route}" for pool_id in others for route in ("results", "squares/public")]
+                if other_paths:
+                    # Touch every pool once so the measured run is not paying for first loads.
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                    for path in other_paths:
+                        conn.request("GET", path)
+                        conn.getresponse().read()
+                    conn.close()
+                    workers = multiprocessing.Pool(1)
+                    job = (port, "GET", other_paths, None, args.duration, args.background_clients, args.seed, args.think)
+                    background = workers.apply_async(_client_loop, (job,))
+                for name, method, path, body_kind in (
+                    ("GET /api/results", "GET", "/api/results", None),
+                    ("POST /api/submissions", "POST", "/api/submissions", "submission"),
+                ):
+                    result = http_load(port, path, args.duration / 2, args.clients, method=method, body_kind=body_kind, seed=args.seed)
+                    result.update({"mode": "pools", "case": f"{name} x{count}", "entries": args.entries, "pools": count, "clients": args.clients})
+                    rows.append(result)
+                    print(f"pools={count:<4} {name:<22} rps={result['rps']:<8} p50={result['p50_ms']:<8} p99={result['p99_ms']:<8} errors={result['errors']}")
+                if background is not None:
+                    latencies, errors = background.get()
+                    workers.close()
+                    print(f"pools={count:<4} background requests={len(latencies)} errors={errors}")
+            finally:
+                proc.terminate()
+                proc.wait()
+    return rows
+
+
+IN_PROCESS_CASES = (
+    "build_results",
+    "build_results_cold",
+    "build_admin_payload",
+    "build_submission_view",
+    "calculate_squares_winners",
+    "submission_write",
+)
+
+HTTP_CASES = (
+    ("GET /api/results", "GET", "/api/results", None),
+    ("GET /api/results/summary", "GET", "/api/results/summary", None),
+    ("GET /api/results/1", "GET", "/api/results/1", None),
+    ("GET /api/admin/state", "GET", "/api/admin/state", None),
+    ("POST /api/view-guesses", "POST", "/api/view-guesses", "view-guesses"),
+    ("POST /api/submissions", "POST", "/api/submissions", "submission"),
+)
+
+
+def bench_in_process(db_path, entries, repeat, seed):
+    use_database(db_path)
+    rng = random.Random(seed)
+    pool = server.POOLS.default()
+    conn = server.get_db()
+    conn.execute("INSERT OR REPLACE INTO correct_answers(question_id, answer_text) VALUES (1, '90'), (2, 'Patriots'), (19, '24')")
+    conn.execute("UPDATE square_game SET q1_pat = 7, q1_sea = 3, q2_pat = 14, q2_sea = 10 WHERE id = 1")
+    conn.commit()
+
+    def cold_results():
+        pool.tallies.reset()
+        server.build_results(pool, conn)
+
+    def write_submission():
+        entry = server.normalize_submission(random_submission(rng, entries + rng.randint(0, 10**9)))
+        server.begin_immediate(conn)
+        server.insert_submission(conn, entry, "2026-02-08T23:45:00Z")
+        conn.commit()
+
+    cases = {
+        "build_results": lambda: server.build_results(pool, conn),
+        # Cold runs rebuild the tallies from scratch, so fewer repeats keep 100k tolerable.
+        "build_results_cold": cold_results,
+        "build_admin_payload": lambda: server.build_admin_payload(pool, conn),
+        "build_submission_view": lambda: server.build_submission_view(conn, f"{rng.randint(0, 9999):04d}"),
+        "calculate_squares_winners": lambda: server.calculate_squares_winners(conn),
+        "submission_write": write_submission,
+    }
+    rows = []
+    server.build_results(pool, conn)
+    for name in IN_PROCESS_CASES:
+        count = max(3, repeat // 10) if name.endswith("_cold") else repeat
+        result = time_calls(cases[name], count)
+        result.update({"mode": "in-process", "case": name, "entries": entries, "samples": count})
+        rows.append(result)
+        print(f"[in-process] entries={entries:<7} {name:<26} p50={result['p50_ms']:<9} p99={result['p99_ms']:<9} ops/s={result['ops_per_sec']}")
+    server.release_db(conn)
+    return rows
+
+
+def bench_http(db_path, entries, args):
+    rows = []
+    port = free_port()
+    proc = start_server(db_path, port, ["--workers", str(args.workers)])
+    try:
+        for name, method, path, body_kind in HTTP_CASES:
+            result = http_load(port, path, args.duration, args.clients, method=method, body_kind=body_kind, seed=args.seed)
+            result.update({"mode": "http", "case": name, "entries": entries, "clients": args.clients, "workers": args.workers})
+            rows.append(result)
+            print(f"[http]       entries={entries:<7} {name:<26} p50={result['p50_ms']:<9} p99={result['p99_ms']:<9} rps={result['rps']} errors={result['errors']}")
+    finally:
+        proc.terminate()
+        proc.wait()
+    return rows
+
+
+def run_metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def bench_suite(args):
+    """Seed each size, then time the hot functions in-process and the routes over HTTP."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            db_path = os.path.join(tmp, f"suite-{entries}.db")
+            seed_database(db_path, entries, seed=args.seed)
+            if not args.skip_in_process:
+                rows.extend(bench_in_process(db_path, entries, args.repeat, args.seed))
+            if not args.skip_http:
+                seed_database(db_path, entries, seed=args.seed)
+                rows.extend(bench_http(db_path, entries, args))
+    return {"meta": run_metadata(args), "results": rows}
+
+
+def compare_runs(args):
+    """Print the p50/p99/throughput change for every case present in both result files."""
+
+    def load(path):
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        rows = data["results"] if isinstance(data, dict) else data
+        return {(r.get("mode"), r.get("case"), r.get("entries")): r for r in rows}
+
+    before, after = load(args.before), load(args.after)
+    rows = []
+    for key in sorted(set(before) & set(after), key=lambda k: tuple(str(p) for p in k)):
+        old, new = before[key], after[key]
+        row = {"mode": key[0], "case": key[1], "entries": key[2]}
+        for metric in ("p50_ms", "p99_ms", "rps", "ops_per_sec"):
+            if metric in old and metric in new and old[metric]:
+                row[metric] = {"before": old[metric], "after": new[metric], "change_pct": round((new[metric] - old[metric]) / old[metric] * 100, 1)}
+        rows.append(row)
+        summary = "  ".join(f"{m}: {v['before']} -> {v['after']} ({v['change_pct']:+}%)" for m, v in row.items() if isinstance(v, dict))
+        print(f"{key[0]:<10} {key[1]:<26} entries={key[2]:<7} {summary}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scaling = sub.add_parser("workers", help="HTTP requests/second against run_server for several worker counts.")
+    scaling.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    scaling.add_argument("--clients", type=int, default=32)
+    scaling.add_argument("--duration", type=float, default=5.0)
+    scaling.add_argument("--entries", type=int, default=200)
+    scaling.add_argument("--path", default="/api/squares/public")
+    scaling.set_defaults(func=bench_worker_scaling)
+
+    writes = sub.add_parser("writes", help="Submission throughput, per-request commit versus group commit.")
+    writes.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32, 64])
+    writes.add_argument("--duration", type=float, default=5.0)
+    writes.add_argument("--entries", type=int, default=1000)
+    writes.add_argument("--workers", type=int, default=64)
+    writes.set_defaults(func=bench_write_modes)
+
+    processes = sub.add_parser("processes", help="Single-process server versus prefork mode with several processes.")
+    processes.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    processes.add_argument("--paths", nargs="+", default=["/api/admin/state", "/api/results"])
+    processes.add_argument("--clients", type=int, default=32)
+    processes.add_argument("--duration", type=float, default=5.0)
+    processes.add_argument("--entries", type=int, default=10000)
+    processes.add_argument("--workers", type=int, default=8, help="Worker threads in each process.")
+    processes.set_defaults(func=bench_processes)
+
+    startup = sub.add_parser("startup", help="Time to first /api/results after launch, full scan versus snapshot.")
+    startup.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    startup.set_defaults(func=bench_startup)
+
+    admin = sub.add_parser("admin", help="build_admin_payload latency as the number of entries grows.")
+    admin.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    admin.add_argument("--repeat", type=int, default=50)
+    admin.set_defaults(func=bench_admin_state)
+
+    ledger = sub.add_parser("ledger", help="Admin refresh after an answer change: full payload versus summary plus one page.")
+    ledger.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    ledger.add_argument("--repeat", type=int, default=10)
+    ledger.set_defaults(func=bench_ledger)
+
+    simulate = sub.add_parser("simulate", help="simulate_payouts latency for a batch of outcome sets.")
+    simulate.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    simulate.add_argument("--scenarios", type=int, default=1000)
+    simulate.add_argument("--people", type=int, default=300, help="Nets returned per scenario.")
+    simulate.add_argument("--repeat", type=int, default=10)
+    simulate.add_argument("--seed", type=int, default=2026)
+    simulate.set_defaults(func=bench_simulate)
+
+    suite = sub.add_parser("suite", help="Seeded in-process and HTTP benchmarks with p50/p99 and throughput.")
+    suite.add_argument("--entries", type=int, nargs="+", default=[100, 10000, 100000])
+    suite.add_argument("--repeat", type=int, default=30, help="Timed calls per in-process case.")
+    suite.add_argument("--duration", type=float, default=3.0, help="Seconds of load per HTTP case.")
+    suite.add_argument("--clients", type=int, default=16)
+    suite.add_argument("--workers", type=int, default=server.DEFAULT_WORKERS)
+    suite.add_argument("--seed", type=int, default=2026)
+    suite.add_argument("--skip-http", action="store_true")
+    suite.add_argument("--skip-in-process", action="store_true")
+    suite.set_defaults(func=bench_suite)
+
+    pools = sub.add_parser("pools", help="Busiest-pool throughput as more pools are hosted alongside it.")
+    pools.add_argument("--pools", type=int, nargs="+", default=[2, 10, 100, 300])
+    pools.add_argument("--entries", type=int, default=2000, help="Submissions seeded into the busiest pool.")
+    pools.add_argument("--pool-entries", type=int, default=50, help="Submissions seeded into every other pool.")
+    pools.add_argument("--clients", type=int, default=16)
+    pools.add_argument("--background-clients", type=int, default=8)
+    pools.add_argument("--think", type=float, default=0.05, help="Seconds each background client waits between requests.")
+    pools.add_argument("--duration", type=float, default=6.0)
+    pools.add_argument("--workers", type=int, default=server.DEFAULT_WORKERS)
+    pools.add_argument("--seed", type=int, default=2026)
+    pools.set_defaults(func=bench_pool_isolation)
+
+    compare = sub.add_parser("compare", help="Compare two --output files from earlier runs.")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.set_defaults(func=compare_runs)
+
+    args = parser.parse_args(argv)
+    rows = args.func(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,781 @@
 #!/usr/bin/env python3
+import argparse
+import bisect
+import contextlib
+import csv
+import gzip
+import io
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import mimetypes
 import os
+import pickle
+import queue
 import random
+import re
+import secrets
+import select
+import shutil
+import signal
+import socket
 import sqlite3
+import sys
+import threading
+import time
+import traceback
+import zlib
+from collections import OrderedDict
 from datetime import datetime
 from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(ROOT_DIR, "static")
 DB_PATH = os.path.join(ROOT_DIR, "data", "superbowl.db")
+QUESTIONS_PATH = os.path.join(ROOT_DIR, "questions.json")
+SCHEMA_VERSION = 2
+SNAPSHOT_VERSION = 1
+BACKUP_INTERVAL = 300
+BACKUP_KEEP = 24
 ADMIN_PASSWORD = "SOUP"
+DEFAULT_POOL_ID = "default"
+POOL_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]{0,39}$")
 SQUARES_COST = 4
 SQUARES_MAX_PER_USER = 5
+SQUARE_HOLD_SECONDS = 120
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+SIMULATE_MAX_SCENARIOS = 5000
+SIMULATE_MAX_RESULTS = 2_000_000
+LEADERBOARD_SIZE = 50
+LEDGER_PAGE_SIZE = 50
+LEDGER_MAX_PAGE_SIZE = 500
+LEDGER_SORTS = ("net", "owed", "paidIn", "name")
+LEDGER_WINNER_PREVIEW = 10
+RESULTS_PAGE_SIZE = 100
+RESULTS_MAX_PAGE_SIZE = 500
+RESULTS_MAX_POINTS = 300
+RESULTS_BINS = 20
+DEFAULT_WORKERS = 16
+DEFAULT_QUEUE_SIZE = 128
+KEEPALIVE_TIMEOUT = 5
+REQUEST_TIMEOUT = 10
+MAX_BODY_SIZE = 64 * 1024
+MAX_UPLOAD_SIZE = 32 * 1024 * 1024
+UPLOAD_PATHS = ("/api/admin/import", "/api/admin/simulate")
+# Token buckets per client address: (burst, tokens refilled per second).
+RATE_LIMITS = {
+    "login": (5, 5 / 60),
+    "view-guesses": (10, 10 / 60),
+    "submissions": (10, 1),
+    "holds": (30, 5),
+}
+RATE_LIMIT_MAX_CLIENTS = 10000
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+STATIC_FINGERPRINTED = ("/app.js", "/styles.css")
+STREAM_MAX_SUBSCRIBERS = 256
+STREAM_MAX_BACKLOG = 256 * 1024
+STREAM_HEARTBEAT = 15
+DB_BUSY_TIMEOUT = 5.0
+DB_STATEMENT_CACHE = 256
+DB_CONNECTIONS_PER_THREAD = 8
+SUBMIT_BATCH_MAX = 256
+SUBMIT_BATCH_WINDOW = 0.002
+SUBMIT_WRITER_IDLE = 60
+QUESTIONS_POLL_INTERVAL = 2
+CHANGE_POLL_INTERVAL = 0.5
+PREFORK_RESTART_DELAY = 1.0
+# Tables whose writes bump data_changes.version. Answers are only ever
+# inserted along with their submission, so that row's trigger covers them.
+CHANGE_TRIGGERS = (
+    ("submissions", ("INSERT", "UPDATE", "DELETE")),
+    ("answers", ("UPDATE", "DELETE")),
+    ("correct_answers", ("INSERT", "UPDATE", "DELETE")),
+    ("square_game", ("INSERT", "UPDATE", "DELETE")),
+    ("square_selections", ("INSERT", "UPDATE", "DELETE")),
+)
+DB_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+METRIC_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(METRIC_BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(METRIC_BUCKETS, seconds)] += 1
+        self.total += seconds
+
+
+class Metrics:
+    """Process-wide counters and latency histograms, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = {}
+        self.request_counts = {}
+        self.phase_latency = {}
+        self.lock_wait = Histogram()
+        self.busy_errors = 0
+        self.bytes_sent = 0
+        self.in_flight = 0
+        self.commit_batches = 0
+        self.committed_entries = 0
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method, route, status, seconds):
+        with self._lock:
+            self.in_flight -= 1
+            self.request_latency.setdefault((route, method), Histogram()).observe(seconds)
+            key = (route, method, str(status))
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def observe_phase(self, phase, seconds):
+        with self._lock:
+            self.phase_latency.setdefault(phase, Histogram()).observe(seconds)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(name, time.perf_counter() - started)
+
+    def observe_lock_wait(self, seconds):
+        with self._lock:
+            self.lock_wait.observe(seconds)
+
+    def count_busy_error(self):
+        with self._lock:
+            self.busy_errors += 1
+
+    def count_bytes(self, size):
+        with self._lock:
+            self.bytes_sent += size
 
-QUESTIONS = [
-    {
-        "id": 1,
-        "text": "How long will Charlie Puth's rendition of the National Anthem last from first note to last?",
-        "type": "numeric",
-        "cost": 1,
-        "min": 0,
-        "max": 500,
-        "suffix": "seconds",
-    },
-    {"id": 2, "text": "Which team will win the coin toss?", "type": "radio", "cost": 1, "options": ["Seahawks", "Patriots"]},
-    {"id": 3, "text": "Which team will make the first touchdown?", "type": "radio", "cost": 2, "options": ["Seahawks", "Patriots"]},
-    {"id": 4, "text": "Which team will make the first field goal?", "type": "radio", "cost": 2, "options": ["Seahawks", "Patriots"]},
-    {
-        "id": 5,
-        "text": "What animal will appear first in the advertisements following kickoff?",
-        "type": "radio",
-        "cost": 1,
-        "options": [
-            "Dog",
-            "Cat",
-            "Horse",
-            "Lizard",
-            "Snake",
-            "Lion",
-            "Elephant",
-            "Monkey/Chimp",
-            "Giraffe",
-            "Fish",
-            "Zebra",
-            "Mouse",
-            "Duck/Goose",
-            "Cow",
-            "Bird",
-            "Other",
-        ],
-    },
-    {"id": 6, "text": "What will be the first beverage commercial shown following kickoff?", "type": "radio", "cost": 1, "options": ["Budweiser", "Miller", "Corona", "Coors", "Pepsi", "Coke", "Fanta", "Sprite", "Other"]},
-    {"id": 7, "text": "What will be the first automobile commercial shown following kickoff?", "type": "radio", "cost": 1, "options": ["Toyota", "Jeep", "GMC", "Ford", "Hyundai", "Honda", "Kia", "BMW", "Mercedes", "VW", "Volvo", "Tesla", "Chevy", "Other"]},
-    {"id": 8, "text": "What will be the first AI commercial shown following kickoff?", "type": "radio", "cost": 1, "options": ["OpenAI/ChatGPT", "Anthropic/Claude", "Google/Gemini", "None", "Other"]},
-    {"id": 9, "text": "What will the Patriots' score be at halftime?", "type": "numeric", "cost": 2, "min": 1, "max": 100},
-    {"id": 10, "text": "What will the Seahawks' score be at halftime?", "type": "numeric", "cost": 2, "min": 1, "max": 100},
-    {"id": 11, "text": "Will Bad Bunny open with Tití Me Preguntó?", "type": "radio", "cost": 1, "options": ["Yes", "No"]},
-    {"id": 12, "text": "Will Bad Bunny switch to English at any point during the halftime show?", "type": "radio", "cost": 1, "options": ["Yes", "No"]},
-    {"id": 13, "text": "Will Bad Bunny have a natively English-speaking guest appear in his show?", "type": "radio", "cost": 1, "options": ["Yes", "No", "No Guest"]},
-    {"id": 14, "text": "Will Bad Bunny make a political statement about ICE during the halftime show?", "type": "radio", "cost": 1, "options": ["Yes", "No"]},
-    {"id": 15, "text": "Will Bad Bunny's performance feature pyrotechnics?", "type": "radio", "cost": 1, "options": ["Yes", "No"]},
-    {"id": 16, "text": "Which insurance company will have the first commercial after the halftime show?", "type": "radio", "cost": 1, "options": ["Allstate", "Geico", "Progressive", "Farmers", "Liberty Mutual", "USAA", "Other"]},
-    {"id": 17, "text": "The first commercial featuring a child after the halftime show will be for a:", "type": "radio", "cost": 1, "options": ["Food", "Beverage", "Insurance", "Car", "Software", "Phone/Internet Service", "Body/Beauty Product", "Movie/TV Show", "Restaurant", "Other"]},
-    {"id": 18, "text": "Who will be leading at the 2-minute warning of Q4?", "type": "radio", "cost": 2, "options": ["Seahawks", "Patriots"]},
-    {"id": 19, "text": "What will the Patriots' final score be?", "type": "numeric", "cost": 2, "min": 1, "max": 100},
-    {"id": 20, "text": "What will the Seahawks' final score be?", "type": "numeric", "cost": 2, "min": 1, "max": 100},
-    {"id": 21, "text": "Who will win the game?", "type": "radio", "cost": 2, "options": ["Seahawks", "Patriots"]},
-    {"id": 22, "text": "What color Gatorade will the winning team dump on the coach?", "type": "radio", "cost": 1, "options": ["Blue", "Green", "Red", "Orange", "Yellow", "Purple", "None"]},
-    {"id": 23, "text": "Who will the winning QB thank first after the game?", "type": "radio", "cost": 1, "options": ["Their wife/kids", "Their parents", "God", "Their team", "Their coach", "The fans"]},
-]
-
-
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+    def count_commit_batch(self, size):
+        with self._lock:
+            self.commit_batches += 1
+            self.committed_entries += size
+
+    def render(self, extra_gauges=()):
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, count in zip(METRIC_BUCKETS + ("+Inf",), hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {cumulative}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {hist.total:.6f}")
+                lines.append(f"{name}_count{suffix} {cumulative}")
+
+        def scalar(name, kind, help_text, value):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+        with self._lock:
+            histogram(
+                "superbowl_http_request_duration_seconds",
+                "Time to handle a request, by route.",
+                [(f'route="{route}",method="{method}"', h) for (route, method), h in sorted(self.request_latency.items())],
+            )
+            lines.append("# HELP superbowl_http_requests_total Requests handled, by route and status.")
+            lines.append("# TYPE superbowl_http_requests_total counter")
+            for (route, method, status), count in sorted(self.request_counts.items()):
+                lines.append(f'superbowl_http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+            histogram(
+                "superbowl_phase_duration_seconds",
+                "Time spent in database queries, Python aggregation and JSON serialization.",
+                [(f'phase="{phase}"', h) for phase, h in sorted(self.phase_latency.items())],
+            )
+            histogram("superbowl_sqlite_lock_wait_seconds", "Time spent waiting for the SQLite write lock.", [("", self.lock_wait)])
+            scalar("superbowl_sqlite_busy_errors_total", "counter", "Write transactions that failed with database locked/busy.", self.busy_errors)
+            scalar("superbowl_http_response_bytes_total", "counter", "Response body bytes written.", self.bytes_sent)
+            scalar("superbowl_http_in_flight_requests", "gauge", "Requests currently being handled.", self.in_flight)
+            scalar("superbowl_submission_batches_total", "counter", "Group commits made by the submission writers.", self.commit_batches)
+            scalar("superbowl_submission_batch_entries_total", "counter", "Submissions written by those group commits.", self.committed_entries)
+        for name, help_text, value in extra_gauges:
+            scalar(name, "gauge", help_text, value)
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def route_label(path):
+    """Collapse a request path into a low-cardinality metrics label."""
+    parsed = urlparse(path).path
+    if not parsed.startswith("/api/"):
+        return "static"
+    parsed = re.sub(r"^/api/pools/[^/]+", "/api/pools/:pool", parsed)
+    return re.sub(r"/\d+(?=/|$)", "/:id", parsed)
+
+
+_db_local = threading.local()
+
+
+def connect_db(path=None):
+    conn = sqlite3.connect(path or DB_PATH, timeout=DB_BUSY_TIMEOUT, cached_statements=DB_STATEMENT_CACHE)
     conn.row_factory = sqlite3.Row
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_db(path=None):
+    """Return this thread's pooled connection to path (default DB_PATH), opening it on first use.
+
+    Connections stay open for the life of the worker thread so the pragmas and
+    the prepared statement cache are paid for once. Hand them back with
+    release_db() instead of closing them. Each thread keeps at most
+    DB_CONNECTIONS_PER_THREAD files open and closes the least recently used,
+    so hosting hundreds of pools does not mean hundreds of descriptors per worker.
+    """
+    path = path or DB_PATH
+    pool = getattr(_db_local, "conns", None)
+    if pool is None:
+        pool = _db_local.conns = OrderedDict()
+    conn = pool.get(path)
+    if conn is None:
+        conn = pool[path] = connect_db(path)
+        while len(pool) > DB_CONNECTIONS_PER_THREAD:
+            _, stale = pool.popitem(last=False)
+            stale.close()
+    else:
+        pool.move_to_end(path)
+        if conn.in_transaction:
+            # A previous request on this thread bailed out mid-transaction.
+            conn.rollback()
     return conn
 
 
-def send_json(handler, payload, status=200):
-    body = json.dumps(payload).encode("utf-8")
+def release_db(conn):
+    if conn.in_transaction:
+        conn.rollback()
+
+
+def close_thread_dbs():
+    """Close every connection this thread has pooled; a child process must not inherit open SQLite handles."""
+    pool = getattr(_db_local, "conns", None)
+    while pool:
+        _, conn = pool.popitem()
+        conn.close()
+
+
+def begin_immediate(conn):
+    """Take the database write lock, recording how long it took to get it."""
+    started = time.perf_counter()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+    except sqlite3.OperationalError:
+        METRICS.count_busy_error()
+        raise
+    finally:
+        METRICS.observe_lock_wait(time.perf_counter() - started)
+
+
+class SubmissionWriter:
+    """Writes one pool's submissions from a single thread, many per commit.
+
+    Handlers validate an entry, claim its squares in SquareOccupancy and call
+    submit(), which blocks until the entry is durable. The writer takes
+    everything queued (lingering SUBMIT_BATCH_WINDOW for stragglers while
+    requests keep arriving), writes each entry under its own savepoint so one
+    rejected entry does not sink the rest, and commits the batch with
+    synchronous=FULL: one fsync covers the whole batch instead of one commit
+    per request. The thread exits after SUBMIT_WRITER_IDLE quiet seconds and
+    restarts on the next submission. With group_commit off, submit() commits
+    inline on the caller's connection instead.
+    """
+
+    group_commit = True
+
+    def __init__(self, db_path, batch_max=SUBMIT_BATCH_MAX, window=SUBMIT_BATCH_WINDOW, idle=SUBMIT_WRITER_IDLE):
+        self.db_path = db_path
+        self.batch_max = batch_max
+        self.window = window
+        self.idle = idle
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def submit(self, entry, now):
+        """Write entry and return its submission id once committed.
+
+        Raises sqlite3.IntegrityError if the database rejected the entry (a
+        square sold in the meantime) and sqlite3.OperationalError if the write
+        lock could not be had.
+        """
+        if not self.group_commit:
+            return self._write_inline(entry, now)
+        item = {"entry": entry, "now": now, "done": threading.Event(), "id": None, "error": None}
+        self._queue.put(item)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+                self._thread.start()
+        item["done"].wait()
+        if item["error"] is not None:
+            raise item["error"]
+        return item["id"]
+
+    def _write_inline(self, entry, now):
+        conn = get_db(self.db_path)
+        try:
+            begin_immediate(conn)
+            with METRICS.phase("db"):
+                submission_id = insert_submission(conn, entry, now)
+                conn.commit()
+            return submission_id
+        finally:
+            release_db(conn)
+
+    def _run(self):
+        conn = connect_db(self.db_path)
+        conn.execute("PRAGMA synchronous = FULL")
+        batch_size = 0
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.idle)]
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        conn.close()
+                        return
+                continue
+            # Only linger when the last batch showed there is company coming.
+            deadline = time.monotonic() + (self.window if batch_size > 1 else 0)
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            batch_size = len(batch)
+            self._write_batch(conn, batch)
+
+    def _write_batch(self, conn, batch):
+        try:
+            begin_immediate(conn)
+            with METRICS.phase("db"):
+                for item in batch:
+                    conn.execute("SAVEPOINT entry")
+                    try:
+                        item["id"] = insert_submission(conn, item["entry"], item["now"])
+                    except sqlite3.IntegrityError as err:
+                        conn.execute("ROLLBACK TO entry")
+                        item["error"] = err
+                    conn.execute("RELEASE entry")
+                conn.commit()
+            METRICS.count_commit_batch(len(batch))
+        except sqlite3.Error as err:
+            if conn.in_transaction:
+                conn.rollback()
+            for item in batch:
+                item["id"] = None
+                item["error"] = err if isinstance(err, sqlite3.OperationalError) else sqlite3.OperationalError(str(err))
+        finally:
+            for item in batch:
+                item["done"].set()
+
+
+class ResponseCache:
+    """Serialized JSON bodies keyed by endpoint, valid for a single data version.
+
+    Pool.refresh() calls bump() whenever the pool's database has changed, so a
+    cached body is served only while nothing it was built from can have changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.version = 0
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+
+    def get(self, key, build):
+        # Read the version before building: a write that lands mid-build bumps
+        # past it, so the possibly stale body is never served for the new version.
+        version = self.version
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2], entry[3]
+        payload = build()
+        with METRICS.phase("serialize"):
+            body = json.dumps(payload).encode("utf-8")
+        etag = content_etag(body)
+        variants = {}
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or current[0] < version:
+                self._entries[key] = (version, body, etag, variants)
+        return body, etag, variants
+
+    def seed(self, key, body):
+        """Install a body built elsewhere (a warm-start snapshot) for the current version."""
+        with self._lock:
+            self._entries[key] = (self.version, body, content_etag(body), {})
+
+
+class EventBroker:
+    """Fans server-sent events out to /api/stream subscribers from one thread.
+
+    Subscribed sockets are detached from the worker pool and switched to
+    non-blocking mode. Each subscribes to one topic (a pool id) and keeps a
+    byte backlog of events it has not accepted yet; a subscriber whose backlog
+    grows past max_backlog is a slow consumer and gets disconnected.
+    """
+
+    def __init__(self, max_subscribers=STREAM_MAX_SUBSCRIBERS, max_backlog=STREAM_MAX_BACKLOG, heartbeat=STREAM_HEARTBEAT):
+        self.max_subscribers = max_subscribers
+        self.max_backlog = max_backlog
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subscribers = {}
+        self._event_id = 0
+        self._thread = None
+
+    def has_room(self):
+        return len(self._subscribers) < self.max_subscribers
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def topics(self):
+        """Topics with at least one live subscriber."""
+        with self._lock:
+            return {topic for topic, _ in self._subscribers.values()}
+
+    def subscribe(self, sock, topic):
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return False
+            sock.setblocking(False)
+            self._subscribers[sock] = (topic, bytearray(b"retry: 3000\n\n"))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-broker", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return True
+
+    def publish(self, topic, event, data):
+        with self._lock:
+            if not self._subscribers:
+                return
+            self._event_id += 1
+            message = f"id: {self._event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+            for subscribed, backlog in self._subscribers.values():
+                if subscribed == topic:
+                    backlog += message
+        self._wake.set()
+
+    def _run(self):
+        last_beat = time.monotonic()
+        pending = False
+        while True:
+            self._wake.wait(0.1 if pending else self.heartbeat)
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                beat = now - last_beat >= self.heartbeat
+                if beat:
+                    last_beat = now
+                pending = False
+                for sock, (_, backlog) in list(self._subscribers.items()):
+                    if beat:
+                        backlog += b": ping\n\n"
+                    try:
+                        while backlog:
+                            sent = sock.send(backlog)
+                            del backlog[:sent]
+                            METRICS.count_bytes(sent)
+                    except BlockingIOError:
+                        pass
+                    except OSError:
+                        self._drop(sock)
+                        continue
+                    if len(backlog) > self.max_backlog:
+                        self._drop(sock)
+                    elif backlog:
+                        pending = True
+
+    def _drop(self, sock):
+        self._subscribers.pop(sock, None)
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+
+BROKER = EventBroker()
+
+
+class RateLimiter:
+    """Token buckets per (client address, budget), refilled continuously.
+
+    Only the routes named in RATE_LIMITS are metered, so the hot GET paths
+    never reach the lock. Once more than max_clients buckets are tracked, full
+    ones (which carry no information) are dropped, then the least recently
+    used, down to half the cap.
+    """
+
+    def __init__(self, budgets=RATE_LIMITS, max_clients=RATE_LIMIT_MAX_CLIENTS):
+        self._lock = threading.Lock()
+        self.budgets = dict(budgets)
+        self.max_clients = max_clients
+        self.enabled = True
+        self._buckets = {}
+
+    def acquire(self, client, budget):
+        """Spend one token; returns 0 if allowed, else the seconds until a token frees up."""
+        if not self.enabled or budget not in self.budgets:
+            return 0
+        burst, rate = self.budgets[budget]
+        now = time.monotonic()
+        with self._lock:
+            key = (client, budget)
+            tokens, stamp = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - stamp) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > self.max_clients:
+                    self._prune(now)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def _prune(self, now):
+        for key, (tokens, stamp) in list(self._buckets.items()):
+            burst, rate = self.budgets[key[1]]
+            if tokens + (now - stamp) * rate >= burst:
+                del self._buckets[key]
+        excess = len(self._buckets) - self.max_clients // 2
+        if excess > 0:
+            stalest = sorted(self._buckets.items(), key=lambda item: item[1][1])[:excess]
+            for key, _ in stalest:
+                del self._buckets[key]
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+LIMITER = RateLimiter()
+
+
+def content_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def etag_matches(handler, etag):
+    header = handler.headers.get("If-None-Match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def accepted_encoding(handler, offered=("br", "gzip")):
+    header = handler.headers.get("Accept-Encoding", "")
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token.strip().lower())
+    if "br" in offered and brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in offered and ("gzip" in accepted or "*" in accepted):
+        return "gzip"
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def send_body(
+    handler,
+    body,
+    status=200,
+    content_type="application/json",
+    etag=None,
+    cache_control="no-cache",
+    variants=None,
+    head=False,
+    headers=None,
+):
+    """Write a complete response, compressing it when the client allows.
+
+    `variants` memoizes compressed copies of an unchanging body (static assets,
+    cached API responses) so each encoding is produced once.
+    """
+    encoding = None
+    if len(body) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+        encoding = accepted_encoding(handler)
+    if encoding is not None:
+        encoded = variants.get(encoding) if variants is not None else None
+        if encoded is None:
+            encoded = compress(body, encoding)
+            if variants is not None:
+                variants[encoding] = encoded
+        body = encoded
+        if etag is not None:
+            etag = f'{etag[:-1]}-{encoding}"'
+
+    if etag is not None and status == 200 and etag_matches(handler, etag):
+        handler.send_response(304)
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", cache_control)
+        handler.send_header("Vary", "Accept-Encoding")
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+        return
     handler.send_response(status)
-    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Type", content_type)
     handler.send_header("Content-Length", str(len(body)))
+    handler.send_header("Vary", "Accept-Encoding")
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if encoding is not None:
+        handler.send_header("Content-Encoding", encoding)
+    if etag is not None:
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", cache_control)
+    handler.end_headers()
+    if not head:
+        handler.wfile.write(body)
+        METRICS.count_bytes(len(body))
+
+
+def send_chunked(handler, blocks, content_type, filename=None):
+    """Stream text blocks as a chunked response, gzipped on the fly when the client allows.
+
+    Nothing is buffered beyond the block being written, so the size of the
+    response does not change how much memory it takes to produce.
+    """
+    gzipper = None
+    if accepted_encoding(handler, offered=("gzip",)):
+        gzipper = zlib.compressobj(6, zlib.DEFLATED, 31)
+    handler.send_response(200)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Transfer-Encoding", "chunked")
+    handler.send_header("Cache-Control", "no-store")
+    handler.send_header("Vary", "Accept-Encoding")
+    if gzipper is not None:
+        handler.send_header("Content-Encoding", "gzip")
+    if filename:
+        handler.send_header("Content-Disposition", f'attachment; filename="{filename}"')
     handler.end_headers()
-    handler.wfile.write(body)
+
+    def write(data):
+        if data:
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            METRICS.count_bytes(len(data))
+
+    try:
+        for block in blocks:
+            data = block.encode("utf-8")
+            write(gzipper.compress(data) if gzipper is not None else data)
+        if gzipper is not None:
+            write(gzipper.flush())
+        handler.wfile.write(b"0\r\n\r\n")
+    except OSError:
+        # The client went away mid-download; the connection cannot be reused.
+        handler.close_connection = True
+
+
+class StaticAsset:
+    def __init__(self, body, content_type, cache_control):
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = content_etag(body)
+        self.variants = {}
+        if len(body) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            self.variants["gzip"] = compress(body, "gzip")
+            if brotli is not None:
+                self.variants["br"] = compress(body, "br")
+
+
+STATIC_ASSETS = {}
+
+
+def load_static_assets(static_dir=None):
+    """Read every file under static/ into memory with precompressed variants.
+
+    app.js and styles.css are referenced from index.html with a content hash
+    query string, so they can be cached for a year; index.html itself is always
+    revalidated against its ETag.
+    """
+    static_dir = static_dir or STATIC_DIR
+    files = {}
+    for dirpath, _, filenames in os.walk(static_dir):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            url_path = "/" + os.path.relpath(full_path, static_dir).replace(os.sep, "/")
+            with open(full_path, "rb") as fh:
+                files[url_path] = fh.read()
+
+    assets = {}
+    fingerprints = {}
+    for url_path in STATIC_FINGERPRINTED:
+        if url_path in files:
+            fingerprints[url_path] = hashlib.sha1(files[url_path]).hexdigest()[:12]
+
+    for url_path, body in files.items():
+        content_type = mimetypes.guess_type(url_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        cache_control = "public, max-age=3600"
+        if url_path == "/index.html":
+            for ref, fingerprint in fingerprints.items():
+                body = body.replace(f'"{ref}"'.encode("utf-8"), f'"{ref}?v={fingerprint}"'.encode("utf-8"))
+            cache_control = "no-cache"
+        assets[url_path] = StaticAsset(body, content_type, cache_control)
+        if url_path in fingerprints:
+            assets[(url_path, fingerprints[url_path])] = StaticAsset(body, content_type, "public, max-age=31536000, immutable")
+
+    STATIC_ASSETS.clear()
+    STATIC_ASSETS.update(assets)
+    return assets
+
+
+def send_json(handler, payload, status=200, headers=None):
+    with METRICS.phase("serialize"):
+        body = json.dumps(payload).encode("utf-8")
+    send_body(handler, body, status, headers=headers)
 
 
 def parse_json(handler):
@@ -111,10 +802,32 @@ def color_for_name(name):
     return palette[value % len(palette)]
 
 
+def person_identity(name):
+    return {"name": name, "initials": initials(name), "color": color_for_name(name)}
+
+
 def digits_only(value):
     return "".join(c for c in str(value or "") if c.isdigit())
 
 
+def phone_last4(phone_number):
+    digits = digits_only(phone_number)
+    return digits[-4:] if len(digits) >= 4 else None
+
+
+def answer_number(answer_text):
+    """The integer value of a numeric answer, stored alongside its text so it can be indexed."""
+    return int(answer_text) if answer_text.isdigit() else None
+
+
+def ensure_column(conn, table, column, declaration):
+    columns = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+    return True
+
+
 def ensure_square_game(conn):
     row = conn.execute("SELECT id FROM square_game WHERE id = 1").fetchone()
     if row:
@@ -134,9 +847,15 @@ def ensure_square_game(conn):
     )
 
 
-def init_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = get_db()
+def init_db(path=None):
+    """Create or migrate the schema; a database already at SCHEMA_VERSION is left alone."""
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = connect_db(path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+    conn.execute("PRAGMA journal_mode = WAL")
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS submissions (
@@ -144,6 +863,7 @@ def init_db():
             full_name TEXT NOT NULL,
             venmo_handle TEXT,
             phone_number TEXT,
+            phone_last4 TEXT,
             payment_method TEXT NOT NULL,
             total_owed REAL NOT NULL,
             created_at TEXT NOT NULL
@@ -154,6 +874,7 @@ def init_db():
             submission_id INTEGER NOT NULL,
             question_id INTEGER NOT NULL,
             answer_text TEXT NOT NULL,
+            answer_num INTEGER,
             FOREIGN KEY(submission_id) REFERENCES submissions(id)
         );
 
@@ -186,44 +907,47 @@ def init_db():
         );
         """
     )
+    ensure_column(conn, "submissions", "phone_last4", "TEXT")
+    if ensure_column(conn, "answers", "answer_num", "INTEGER"):
+        conn.execute(
+            "UPDATE answers SET answer_num = CAST(answer_text AS INTEGER) WHERE answer_text != '' AND answer_text NOT GLOB '*[^0-9]*'"
+        )
+    missing = conn.execute(
+        "SELECT id, phone_number FROM submissions WHERE phone_last4 IS NULL AND phone_number IS NOT NULL AND phone_number != ''"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE submissions SET phone_last4 = ? WHERE id = ?",
+        [(phone_last4(r["phone_number"]), r["id"]) for r in missing if phone_last4(r["phone_number"])],
+    )
+    conn.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_submissions_phone_last4 ON submissions(phone_last4, id);
+        CREATE INDEX IF NOT EXISTS idx_answers_submission ON answers(submission_id);
+        DROP INDEX IF EXISTS idx_answers_question;
+        CREATE INDEX IF NOT EXISTS idx_answers_question_num ON answers(question_id, answer_num);
+        CREATE INDEX IF NOT EXISTS idx_square_selections_submission ON square_selections(submission_id);
+
+        CREATE TABLE IF NOT EXISTS data_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO data_changes(id, version) VALUES (1, 0);
+        """
+    )
+    for table, events in CHANGE_TRIGGERS:
+        for event in events:
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_changes AFTER {event} ON {table}
+                BEGIN UPDATE data_changes SET version = version + 1 WHERE id = 1; END
+                """
+            )
     ensure_square_game(conn)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
 
 
-def validate_answer(question, answer):
-    if answer is None:
-        return None
-    if isinstance(answer, str):
-        answer = answer.strip()
-    if answer == "":
-        return None
-
-    if question["type"] == "numeric":
-        if isinstance(answer, bool):
-            raise ValueError("Numeric answer must be an integer")
-        if isinstance(answer, str):
-            if not answer.isdigit():
-                raise ValueError("Numeric answer must be an integer")
-            value = int(answer)
-        elif isinstance(answer, int):
-            value = answer
-        else:
-            raise ValueError("Numeric answer must be an integer")
-        if value < question["min"] or value > question["max"]:
-            raise ValueError(f"Answer for Q{question['id']} must be between {question['min']} and {question['max']}")
-        return str(value)
-
-    if question["type"] == "radio":
-        if not isinstance(answer, str):
-            raise ValueError("Multiple choice answer must be text")
-        if answer not in question["options"]:
-            raise ValueError(f"Invalid option for Q{question['id']}")
-        return answer
-
-    raise ValueError("Unsupported question type")
-
-
 def get_square_board(conn):
     ensure_square_game(conn)
     row = conn.execute("SELECT * FROM square_game WHERE id = 1").fetchone()
@@ -239,8 +963,34 @@ def get_square_board(conn):
     }
 
 
-def list_square_selections(conn, with_people=False):
-    if with_people:
+def parse_quarter_scores(raw, partial=False):
+    """Validate {quarter: {patriots, seahawks}} scores; blank scores become None.
+
+    With partial, quarters missing from raw are left out instead of cleared.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Invalid scores payload.")
+    scores = {}
+    for quarter in ["q1", "q2", "q3", "q4"]:
+        if partial and quarter not in raw:
+            continue
+        q_scores = raw.get(quarter) or {}
+        if not isinstance(q_scores, dict):
+            raise ValueError(f"Invalid scores for {quarter}.")
+        scores[quarter] = {}
+        for team in ["patriots", "seahawks"]:
+            value = q_scores.get(team)
+            if value is None or value == "":
+                value = None
+            elif not isinstance(value, int) or isinstance(value, bool) or value < 0 or value > 200:
+                raise ValueError(f"Invalid score for {quarter} {team}.")
+            scores[quarter][team] = value
+    return scores
+
+
+def list_square_selections(conn, identity=None):
+    """Every sold square; with `identity`, each also carries its owner's {name, initials, color}."""
+    if identity is not None:
         rows = conn.execute(
             """
             SELECT sq.row_idx, sq.col_idx, s.full_name
@@ -248,49 +998,170 @@ def list_square_selections(conn, with_people=False):
             JOIN submissions s ON s.id = sq.submission_id
             """
         ).fetchall()
-        return [
-            {
-                "row": r["row_idx"],
-                "col": r["col_idx"],
-                "name": r["full_name"],
-                "initials": initials(r["full_name"]),
-                "color": color_for_name(r["full_name"]),
-            }
-            for r in rows
-        ]
+        return [{"row": r["row_idx"], "col": r["col_idx"], **identity(r["full_name"])} for r in rows]
 
     rows = conn.execute("SELECT row_idx, col_idx FROM square_selections").fetchall()
     return [{"row": r["row_idx"], "col": r["col_idx"]} for r in rows]
 
 
-def build_squares_public(conn):
+class SquareOccupancy:
+    """The 10x10 squares board as a 100-bit integer, plus short-lived holds.
+
+    Bit row * 10 + col is set once a square is sold. Holds let a guest claim
+    squares while still filling in the form; they lapse after
+    SQUARE_HOLD_SECONDS unless renewed. A submission claims its squares here
+    before it touches the database, so two guests racing for different squares
+    never wait on each other. The UNIQUE(row_idx, col_idx) constraint remains
+    the final guard against double sales.
+    """
+
+    def __init__(self, tallies):
+        self._lock = threading.Lock()
+        self.tallies = tallies
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bits = 0
+            self.owners = {}
+            self.holds = {}
+            self.last_selection_id = 0
+
+    def sync(self, conn):
+        with self._lock:
+            rows = conn.execute(
+                """
+                SELECT sq.id, sq.row_idx, sq.col_idx, s.full_name
+                FROM square_selections sq
+                JOIN submissions s ON s.id = sq.submission_id
+                WHERE sq.id > ?
+                ORDER BY sq.id
+                """,
+                (self.last_selection_id,),
+            ).fetchall()
+            for row in rows:
+                cell = row["row_idx"] * 10 + row["col_idx"]
+                self.bits |= 1 << cell
+                self.owners[cell] = self.tallies.identity(row["full_name"])
+                self.holds.pop(cell, None)
+                self.last_selection_id = row["id"]
+
+    def _expire(self, now):
+        for cell in [c for c, (_, expires) in self.holds.items() if expires <= now]:
+            del self.holds[cell]
+
+    def _conflicts(self, cells, token):
+        return [c for c in cells if self.bits >> c & 1 or (c in self.holds and self.holds[c][0] != token)]
+
+    def hold(self, token, squares, ttl=SQUARE_HOLD_SECONDS):
+        """Replace token's holds with `squares`; returns the conflicting squares, if any."""
+        cells = [sq["row"] * 10 + sq["col"] for sq in squares]
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            conflicts = self._conflicts(cells, token)
+            if conflicts:
+                return [{"row": c // 10, "col": c % 10} for c in conflicts]
+            for cell in [c for c, (owner, _) in self.holds.items() if owner == token]:
+                del self.holds[cell]
+            for cell in cells:
+                self.holds[cell] = (token, now + ttl)
+            return []
+
+    def release(self, token):
+        with self._lock:
+            for cell in [c for c, (owner, _) in self.holds.items() if owner == token]:
+                del self.holds[cell]
+
+    def claim(self, squares, token=None):
+        """Reserve squares for a submission about to be written.
+
+        Squares held under `token` may be claimed by it. Returns the claim
+        token to pass to sold() or release() and the squares that are
+        unavailable; nothing is reserved unless that list is empty.
+        """
+        claim_token = token or secrets.token_urlsafe(12)
+        cells = [sq["row"] * 10 + sq["col"] for sq in squares]
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            conflicts = self._conflicts(cells, claim_token)
+            if conflicts:
+                return claim_token, [{"row": c // 10, "col": c % 10} for c in conflicts]
+            for cell in cells:
+                self.holds[cell] = (claim_token, now + SQUARE_HOLD_SECONDS)
+            return claim_token, []
+
+    def sold(self, squares, person, token):
+        with self._lock:
+            for sq in squares:
+                cell = sq["row"] * 10 + sq["col"]
+                self.bits |= 1 << cell
+                self.owners[cell] = person
+            for cell in [c for c, (owner, _) in self.holds.items() if owner == token]:
+                del self.holds[cell]
+
+    def taken(self):
+        with self._lock:
+            return [dict(self.owners[c], row=c // 10, col=c % 10) for c in sorted(self.owners)]
+
+    def held(self, exclude_token=None):
+        with self._lock:
+            self._expire(time.monotonic())
+            return [{"row": c // 10, "col": c % 10} for c, (owner, _) in sorted(self.holds.items()) if owner != exclude_token]
+
+    def state(self):
+        """The sold squares as plain data for a warm-start snapshot; holds are not kept."""
+        with self._lock:
+            return {
+                "bits": self.bits,
+                "owners": {cell: owner["name"] for cell, owner in self.owners.items()},
+                "last_selection_id": self.last_selection_id,
+            }
+
+    def restore(self, state):
+        with self._lock:
+            self.bits = state["bits"]
+            self.owners = {cell: self.tallies.identity(name) for cell, name in state["owners"].items()}
+            self.holds = {}
+            self.last_selection_id = state["last_selection_id"]
+
+
+def build_squares_public(pool, conn, token=None):
+    pool.occupancy.sync(conn)
     return {
         "cost": SQUARES_COST,
         "maxPerUser": SQUARES_MAX_PER_USER,
-        "taken": list_square_selections(conn, with_people=True),
+        "holdSeconds": SQUARE_HOLD_SECONDS,
+        "taken": pool.occupancy.taken(),
+        "held": pool.occupancy.held(exclude_token=token),
     }
 
 
-def build_squares_revealed(conn):
-    board = get_square_board(conn)
+def build_squares_revealed(pool, conn, board=None, selections=None):
+    board = board or get_square_board(conn)
+    if selections is None:
+        pool.occupancy.sync(conn)
+        selections = pool.occupancy.taken()
     return {
         "cost": SQUARES_COST,
         "rowDigits": board["rowDigits"],
         "colDigits": board["colDigits"],
-        "taken": list_square_selections(conn, with_people=True),
+        "taken": selections,
     }
 
 
 def build_submission_view(conn, last4):
-    rows = conn.execute(
-        "SELECT id, full_name, venmo_handle, phone_number, created_at FROM submissions ORDER BY id DESC"
-    ).fetchall()
-    target = str(last4 or "").strip()
-    submission = None
-    for row in rows:
-        if digits_only(row["phone_number"]).endswith(target):
-            submission = row
-            break
+    submission = conn.execute(
+        """
+        SELECT id, full_name, venmo_handle, phone_number, created_at
+        FROM submissions
+        WHERE phone_last4 = ?
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (str(last4 or "").strip(),),
+    ).fetchone()
     if submission is None:
         return None
 
@@ -308,95 +1179,1307 @@ def build_submission_view(conn, last4):
     }
 
 
-def build_results(conn):
-    rows = conn.execute(
-        """
-        SELECT a.question_id, a.answer_text, s.full_name
-        FROM answers a
-        JOIN submissions s ON s.id = a.submission_id
-        """
-    ).fetchall()
-    grouped = {}
-    for row in rows:
-        grouped.setdefault(row["question_id"], []).append(dict(row))
+class AnswerTallies:
+    """Per-question aggregates kept in step with the submissions and answers tables.
 
-    question_summaries = []
-    for q in QUESTIONS:
-        q_rows = grouped.get(q["id"], [])
-        if q["type"] == "numeric":
-            points = []
-            values = []
-            for r in q_rows:
-                try:
-                    val = int(r["answer_text"])
-                except ValueError:
+    Both tables are append-only, so sync() only reads rows past the highest id
+    it has already folded in. Every distinct name gets a participant id once,
+    holding its initials and color; radio questions keep the participant ids
+    behind each option and numeric questions keep their points sorted by value.
+    """
+
+    def __init__(self, questions):
+        self._lock = threading.Lock()
+        self.questions = questions
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.last_submission_id = 0
+            self.last_answer_id = 0
+            self.total_submissions = 0
+            self.paid_by_name = {}
+            self.participant_ids = {}
+            self.participants = []
+            self.answered = {q["id"]: 0 for q in self.questions}
+            self.options = {q["id"]: {opt: [] for opt in q["options"]} for q in self.questions if q["type"] == "radio"}
+            self.numeric_keys = {q["id"]: [] for q in self.questions if q["type"] == "numeric"}
+            self.numeric_points = {q["id"]: [] for q in self.questions if q["type"] == "numeric"}
+            self._matrix = None
+
+    def sync(self, conn):
+        with self._lock:
+            submissions = conn.execute(
+                "SELECT id, full_name, total_owed FROM submissions WHERE id > ? ORDER BY id",
+                (self.last_submission_id,),
+            ).fetchall()
+            for row in submissions:
+                self._participant(row["full_name"])
+                self.total_submissions += 1
+                self.paid_by_name[row["full_name"]] = self.paid_by_name.get(row["full_name"], 0) + float(row["total_owed"] or 0)
+                self.last_submission_id = row["id"]
+
+            rows = conn.execute(
+                """
+                SELECT a.id, a.question_id, a.answer_text, a.answer_num, s.full_name
+                FROM answers a
+                JOIN submissions s ON s.id = a.submission_id
+                WHERE a.id > ?
+                ORDER BY a.id
+                """,
+                (self.last_answer_id,),
+            ).fetchall()
+            if not rows:
+                return
+            new_points = {}
+            for row in rows:
+                self.last_answer_id = row["id"]
+                qid = row["question_id"]
+                if qid not in self.answered:
+                    continue
+                self.answered[qid] += 1
+                pid = self._participant(row["full_name"])
+                if qid in self.options:
+                    bucket = self.options[qid].get(row["answer_text"])
+                    if bucket is not None:
+                        bucket.append(pid)
                     continue
-                values.append(val)
-                points.append(
+                value = row["answer_num"]
+                if value is None:
+                    continue
+                new_points.setdefault(qid, []).append(((value, row["id"]), {"participant": pid, "value": value}))
+
+            for qid, items in new_points.items():
+                keys = self.numeric_keys[qid]
+                points = self.numeric_points[qid]
+                if len(items) > 16:
+                    merged = sorted(list(zip(keys, points)) + items, key=lambda item: item[0])
+                    keys[:] = [k for k, _ in merged]
+                    points[:] = [p for _, p in merged]
+                    continue
+                for key, point in items:
+                    idx = bisect.bisect_right(keys, key)
+                    keys.insert(idx, key)
+                    points.insert(idx, point)
+
+    def _participant(self, name):
+        pid = self.participant_ids.get(name)
+        if pid is None:
+            pid = self.participant_ids[name] = len(self.participants)
+            self.participants.append(person_identity(name))
+        return pid
+
+    def participant_id(self, name):
+        with self._lock:
+            return self._participant(name)
+
+    def identity(self, name):
+        """Return the shared {name, initials, color} record for name."""
+        with self._lock:
+            return self.participants[self._participant(name)]
+
+    def identities(self, names):
+        with self._lock:
+            return [self.participants[self._participant(name)] for name in names]
+
+    def results_snapshot(self):
+        with self._lock:
+            return self._results_snapshot()
+
+    def _results_snapshot(self):
+        question_summaries = []
+        for q in self.questions:
+            if q["type"] == "numeric":
+                points = list(self.numeric_points[q["id"]])
+                highest = self.numeric_keys[q["id"]][-1][0] if points else 1
+                question_summaries.append(
                     {
-                        "name": r["full_name"],
-                        "initials": initials(r["full_name"]),
-                        "color": color_for_name(r["full_name"]),
-                        "value": val,
+                        "id": q["id"],
+                        "text": q["text"],
+                        "type": "numeric",
+                        "cost": q["cost"],
+                        "scaleMax": max(5, int(round(highest * 1.05))),
+                        "points": points,
                     }
                 )
-            highest = max(values) if values else 1
-            question_summaries.append(
-                {
-                    "id": q["id"],
-                    "text": q["text"],
-                    "type": "numeric",
-                    "cost": q["cost"],
-                    "scaleMax": max(5, int(round(highest * 1.05))),
-                    "points": points,
-                }
-            )
-        else:
-            option_map = {opt: [] for opt in q["options"]}
-            for r in q_rows:
-                if r["answer_text"] in option_map:
-                    option_map[r["answer_text"]].append(
-                        {
-                            "name": r["full_name"],
-                            "initials": initials(r["full_name"]),
-                            "color": color_for_name(r["full_name"]),
-                        }
-                    )
-            bars = [{"option": opt, "count": len(option_map[opt]), "participants": option_map[opt]} for opt in q["options"]]
-            question_summaries.append(
-                {"id": q["id"], "text": q["text"], "type": "radio", "cost": q["cost"], "bars": bars}
-            )
+            else:
+                option_map = self.options[q["id"]]
+                bars = [{"option": opt, "count": len(option_map[opt]), "participants": list(option_map[opt])} for opt in q["options"]]
+                question_summaries.append(
+                    {"id": q["id"], "text": q["text"], "type": "radio", "cost": q["cost"], "bars": bars}
+                )
+        return {
+            "questions": question_summaries,
+            "participants": list(self.participants),
+            "totalSubmissions": self.total_submissions,
+            "lastSubmissionId": self.last_submission_id,
+        }
 
-    total_submissions = conn.execute("SELECT COUNT(*) AS c FROM submissions").fetchone()["c"]
-    return {"questions": question_summaries, "totalSubmissions": total_submissions}
+    def results_summary(self):
+        """Counts per option and a histogram per numeric question, without naming anyone."""
+        with self._lock:
+            question_summaries = []
+            for q in self.questions:
+                summary = {"id": q["id"], "text": q["text"], "type": q["type"], "cost": q["cost"], "count": self.answered[q["id"]]}
+                if q["type"] == "numeric":
+                    summary["scaleMax"], summary["bins"] = self._histogram(q["id"])
+                else:
+                    summary["bars"] = [{"option": opt, "count": len(self.options[q["id"]][opt])} for opt in q["options"]]
+                question_summaries.append(summary)
+            return {
+                "questions": question_summaries,
+                "totalSubmissions": self.total_submissions,
+                "lastSubmissionId": self.last_submission_id,
+            }
 
+    def _histogram(self, qid):
+        """(scale max, RESULTS_BINS or fewer equal-width bins from 0 to it) for numeric question qid."""
+        keys = self.numeric_keys[qid]
+        scale_max = max(5, int(round(keys[-1][0] * 1.05))) if keys else 5
+        start = min(0, math.floor(keys[0][0])) if keys else 0
+        width = max(1, math.ceil((scale_max - start + 1) / RESULTS_BINS))
+        bins = []
+        lo = bisect.bisect_left(keys, (start,))
+        while start <= scale_max:
+            hi = bisect.bisect_left(keys, (start + width,))
+            bins.append({"from": start, "to": start + width - 1, "count": hi - lo})
+            start, lo = start + width, hi
+        return scale_max, bins
 
-def calculate_squares_winners(conn):
-    board = get_square_board(conn)
-    selections = list_square_selections(conn, with_people=True)
-    pot = SQUARES_COST * len(selections)
-    quarter_share = round(pot / 4, 2)
+    def question_page(self, q, option=None, cursor=None, limit=RESULTS_PAGE_SIZE):
+        """Who answered q and what, a page at a time.
 
-    sel_map = {(s["row"], s["col"]): s for s in selections}
+        Radio answers come option by option in the order they were submitted,
+        optionally for one option only; numeric guesses come in value order.
+        The cursor names the last entry returned rather than a position, so
+        entries submitted while someone pages through never repeat. Numeric
+        questions also get their raw points for the chart, or bins once there
+        are more than RESULTS_MAX_POINTS of them. Raises ValueError on a bad
+        option or cursor.
+        """
+        qid = q["id"]
+        with self._lock:
+            detail = {"id": qid, "text": q["text"], "type": q["type"], "cost": q["cost"], "count": self.answered[qid]}
+            entries = []
+            next_cursor = None
+            if q["type"] == "numeric":
+                keys = self.numeric_keys[qid]
+                points = self.numeric_points[qid]
+                detail["scaleMax"], bins = self._histogram(qid)
+                if len(points) > RESULTS_MAX_POINTS:
+                    detail["bins"] = bins
+                else:
+                    detail["points"] = [dict(self.participants[point["participant"]], value=point["value"]) for point in points]
+                start = 0
+                if cursor:
+                    value, _, answer_id = cursor.partition(":")
+                    try:
+                        start = bisect.bisect_right(keys, (float(value), int(answer_id)))
+                    except ValueError:
+                        raise ValueError("Invalid cursor.") from None
+                end = min(start + limit, len(points))
+                entries = [(point["participant"], point["value"]) for point in points[start:end]]
+                if end < len(points):
+                    next_cursor = f"{keys[end - 1][0]}:{keys[end - 1][1]}"
+            else:
+                option_map = self.options[qid]
+                detail["bars"] = [{"option": opt, "count": len(option_map[opt])} for opt in q["options"]]
+                if option is not None and option not in option_map:
+                    raise ValueError("Unknown option.")
+                first, position = 0, 0
+                if cursor:
+                    try:
+                        first, position = (int(part) for part in cursor.split(":"))
+                    except ValueError:
+                        raise ValueError("Invalid cursor.") from None
+                wanted = [(index, opt) for index, opt in enumerate(q["options"]) if index >= first and option in (None, opt)]
+                for index, opt in wanted:
+                    pids = option_map[opt]
+                    start = position if index == first else 0
+                    taken = pids[start : start + limit - len(entries)]
+                    entries.extend((pid, opt) for pid in taken)
+                    if len(entries) == limit:
+                        end = start + len(taken)
+                        if end < len(pids) or any(option_map[later] for i, later in wanted if i > index):
+                            next_cursor = f"{index}:{end}"
+                        break
+            detail["participants"] = [dict(self.participants[pid], answer=answer) for pid, answer in entries]
+            detail["nextCursor"] = next_cursor
+            return detail
 
-    payouts = {}
-    quarter_results = {}
-    for quarter_key in ["q1", "q2", "q3", "q4"]:
-        p_score = board["scores"][quarter_key]["patriots"]
-        s_score = board["scores"][quarter_key]["seahawks"]
-        result = {
-            "patriots": p_score,
-            "seahawks": s_score,
-            "winner": None,
-            "cell": None,
-            "amount": quarter_share,
-        }
+    def answered_counts(self):
+        with self._lock:
+            return dict(self.answered)
 
-        if p_score is not None and s_score is not None:
-            p_digit = p_score % 10
-            s_digit = s_score % 10
-            try:
-                row_idx = board["rowDigits"].index(s_digit)
+    def relabel(self, questions):
+        """Swap in an edited question set with the same tally_shape (new text, costs or bounds)."""
+        with self._lock:
+            self.questions = questions
+
+    def option_names(self, qid, option):
+        """Names of everyone who picked `option` on radio question qid."""
+        with self._lock:
+            return [self.participants[pid]["name"] for pid in self.options[qid].get(option, [])]
+
+    def paid_in(self):
+        with self._lock:
+            return dict(self.paid_by_name)
+
+    def winners(self, q, answer):
+        """(participant ids that win q if `answer` is correct, how many answered q)."""
+        with self._lock:
+            qid = q["id"]
+            if q["type"] != "numeric":
+                return frozenset(self.options[qid].get(answer, ())), self.answered[qid]
+            keys = self.numeric_keys[qid]
+            points = self.numeric_points[qid]
+            target = int(answer)
+            idx = bisect.bisect_left(keys, (target,))
+            winning = nearest_values(keys[idx - 1][0] if idx else None, keys[idx][0] if idx < len(keys) else None, target)
+            pids = set()
+            for value in winning:
+                lo, hi = bisect.bisect_left(keys, (value,)), bisect.bisect_left(keys, (value + 1,))
+                pids.update(point["participant"] for point in points[lo:hi])
+            return frozenset(pids), self.answered[qid]
+
+    def state(self):
+        """Everything sync() has folded in, as plain data for a warm-start snapshot.
+
+        Includes the /api/results payload for that same state, so a restart
+        does not have to rebuild it.
+        """
+        with self._lock:
+            return {
+                "last_submission_id": self.last_submission_id,
+                "last_answer_id": self.last_answer_id,
+                "total_submissions": self.total_submissions,
+                "paid_by_name": dict(self.paid_by_name),
+                "participants": [(p["name"], p["initials"], p["color"]) for p in self.participants],
+                "answered": dict(self.answered),
+                "options": {qid: {opt: list(pids) for opt, pids in option_map.items()} for qid, option_map in self.options.items()},
+                "numeric_keys": {qid: list(keys) for qid, keys in self.numeric_keys.items()},
+                "numeric_participants": {qid: [p["participant"] for p in points] for qid, points in self.numeric_points.items()},
+                "results": self._results_snapshot(),
+            }
+
+    def restore(self, state):
+        with self._lock:
+            self.last_submission_id = state["last_submission_id"]
+            self.last_answer_id = state["last_answer_id"]
+            self.total_submissions = state["total_submissions"]
+            self.paid_by_name = state["paid_by_name"]
+            self.participants = [{"name": name, "initials": mark, "color": color} for name, mark, color in state["participants"]]
+            self.participant_ids = {p["name"]: pid for pid, p in enumerate(self.participants)}
+            self.answered = state["answered"]
+            self.options = state["options"]
+            self.numeric_keys = state["numeric_keys"]
+            self.numeric_points = {
+                qid: [{"participant": pid, "value": key[0]} for key, pid in zip(keys, state["numeric_participants"][qid])]
+                for qid, keys in self.numeric_keys.items()
+            }
+            self._matrix = None
+
+    def answer_matrix(self):
+        """An AnswerMatrix of everything synced so far, rebuilt only after new rows arrive."""
+        with self._lock:
+            version = (self.last_submission_id, self.last_answer_id)
+            if self._matrix is None or self._matrix.version != version:
+                self._matrix = AnswerMatrix(self, version)
+            return self._matrix
+
+
+class AnswerMatrix:
+    """Who picked what, indexed for scoring many outcome sets at once.
+
+    Built from AnswerTallies under its lock. `options` maps each radio option
+    to the set of participant ids that picked it; `numeric` holds each numeric
+    question's distinct values, sorted, with the participant ids behind each.
+    """
+
+    def __init__(self, tallies, version):
+        self.version = version
+        self.names = [p["name"] for p in tallies.participants]
+        self.ids = dict(tallies.participant_ids)
+        self.paid = [tallies.paid_by_name.get(name, 0.0) for name in self.names]
+        self.answered = dict(tallies.answered)
+        self.options = {
+            qid: {option: frozenset(pids) for option, pids in option_map.items()} for qid, option_map in tallies.options.items()
+        }
+        self.numeric = {}
+        for qid, points in tallies.numeric_points.items():
+            by_value = {}
+            for point in points:
+                by_value.setdefault(point["value"], set()).add(point["participant"])
+            self.numeric[qid] = (sorted(by_value), by_value)
+
+    def outcome(self, q, answer):
+        """(winning participant ids, split per winner, amount paid out) if `answer` is correct for q."""
+        if q["type"] == "numeric":
+            values, by_value = self.numeric[q["id"]]
+            target = int(answer)
+            idx = bisect.bisect_left(values, target)
+            winning = nearest_values(values[idx - 1] if idx else None, values[idx] if idx < len(values) else None, target)
+            winners = frozenset().union(*(by_value[value] for value in winning))
+        else:
+            winners = self.options[q["id"]].get(answer, frozenset())
+        if not winners:
+            return winners, 0, 0
+        collected = q["cost"] * self.answered[q["id"]]
+        return winners, collected / len(winners), collected
+
+
+class Leaderboard:
+    """Questions won and winnings per participant, kept current one question at a time.
+
+    Each question with a saved correct answer contributes (winners, split).
+    Setting or changing an answer moves only that question's contribution, new
+    submissions redo only the questions that have an answer, and squares
+    payouts are re-applied when the board changes. `top` holds the
+    LEADERBOARD_SIZE best participant ids. It is merged with whoever moved up
+    and rebuilt from scratch only when someone in it moved down.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._tallies = None
+
+    def _reset(self, tallies):
+        self._tallies = tallies
+        self.version = None
+        self.answers = {}
+        self.contrib = {}
+        self.squares_key = None
+        self.squares = {}
+        self.correct = []
+        self.winnings = []
+        self.top = []
+
+    def _rank_key(self, pid):
+        return (-round(self.winnings[pid], 2), -self.correct[pid], self._tallies.participants[pid]["name"])
+
+    def sync(self, conn):
+        """Fold in new submissions, correct answers and square scores; returns the standings payload."""
+        tallies = self.pool.tallies
+        tallies.sync(conn)
+        saved = {r["question_id"]: r["answer_text"] for r in conn.execute("SELECT question_id, answer_text FROM correct_answers")}
+        board = get_square_board(conn)
+        with self._lock:
+            if tallies is not self._tallies:
+                self._reset(tallies)
+            version = (tallies.last_submission_id, tallies.last_answer_id)
+            questions = {q["id"]: q for q in self.pool.questions}
+            saved = {qid: answer for qid, answer in saved.items() if qid in questions}
+            if version != self.version:
+                dirty = set(saved) | set(self.answers)
+            else:
+                dirty = {qid for qid in set(saved) | set(self.answers) if saved.get(qid) != self.answers.get(qid)}
+
+            before = {pid: self._rank_key(pid) for pid in self.top}
+            count = len(tallies.participants)
+            changed = set(range(len(self.correct), count))
+            self.correct.extend([0] * (count - len(self.correct)))
+            self.winnings.extend([0.0] * (count - len(self.winnings)))
+            touched = set()
+            for qid in dirty:
+                old_winners, _ = self.contrib.pop(qid, (frozenset(), 0))
+                touched.update(old_winners)
+                for pid in old_winners:
+                    self.correct[pid] -= 1
+                answer = saved.get(qid)
+                self.answers.pop(qid, None)
+                if answer is None:
+                    continue
+                self.answers[qid] = answer
+                winners, answered = tallies.winners(questions[qid], answer)
+                if not winners:
+                    continue
+                split = questions[qid]["cost"] * answered / len(winners)
+                self.contrib[qid] = (winners, split)
+                touched.update(winners)
+                for pid in winners:
+                    self.correct[pid] += 1
+
+            squares_key = (json.dumps(board, sort_keys=True), version)
+            if squares_key != self.squares_key:
+                self.squares_key = squares_key
+                selections = list_square_selections(conn, identity=person_identity)
+                payouts = calculate_squares_winners(None, board, selections)["payoutByName"]
+                squares = {tallies.participant_id(name): amount for name, amount in payouts.items()}
+                touched.update(self.squares, squares)
+                self.squares = squares
+                if len(tallies.participants) > count:
+                    # A square owner whose answers have not been folded in yet.
+                    self.correct.extend([0] * (len(tallies.participants) - count))
+                    self.winnings.extend([0.0] * (len(tallies.participants) - count))
+                    changed.update(range(count, len(tallies.participants)))
+
+            # Summed afresh in question order, then squares, as score_admin_payload
+            # does, so no rounding drift builds up and the cents always agree.
+            parts = [self.contrib[qid] for qid in questions if qid in self.contrib]
+            for pid in touched:
+                amount = sum(split for winners, split in parts if pid in winners)
+                if pid in self.squares:
+                    amount += self.squares[pid]
+                self.winnings[pid] = amount
+            changed |= touched
+            # Nobody outside the top moved without being in `changed`, so unless
+            # someone in the top fell it is enough to re-rank the two together.
+            if any(self._rank_key(pid) > key for pid, key in before.items()):
+                names = [person["name"] for person in tallies.participants]
+                ranked = zip([-round(w, 2) for w in self.winnings], [-c for c in self.correct], names, range(len(names)))
+                self.top = [row[3] for row in heapq.nsmallest(LEADERBOARD_SIZE, ranked)]
+            else:
+                self.top = heapq.nsmallest(LEADERBOARD_SIZE, set(self.top) | changed, key=self._rank_key)
+            self.version = version
+            return self._payload(questions)
+
+    def _payload(self, questions):
+        leaders = []
+        rank, previous = 0, None
+        for position, pid in enumerate(self.top):
+            if not self.correct[pid] and round(self.winnings[pid], 2) <= 0:
+                break
+            key = self._rank_key(pid)[:2]
+            if key != previous:
+                rank, previous = position + 1, key
+            person = self._tallies.participants[pid]
+            leaders.append(
+                {
+                    "rank": rank,
+                    "name": person["name"],
+                    "initials": person["initials"],
+                    "color": person["color"],
+                    "correct": self.correct[pid],
+                    "winnings": round(self.winnings[pid], 2),
+                }
+            )
+        return {
+            "leaders": leaders,
+            "participants": len(self.correct),
+            "answeredQuestions": len(self.answers),
+            "totalQuestions": len(questions),
+        }
+
+    def standings(self):
+        """(tallies, (last submission id, last answer id), winnings per participant id,
+        {qid: (winners, split)}, {qid: answer}) as of the last sync()."""
+        with self._lock:
+            return self._tallies, self.version, list(self.winnings), dict(self.contrib), dict(self.answers)
+
+
+class Ledger:
+    """Paid in, owed and net per participant for the admin page, served a page at a time.
+
+    Owed is the leaderboard's winnings, so after a correct answer or a score
+    changes only the participants whose winnings moved are redone; paid in is
+    re-read only when new entries arrive. Names sit in a sorted index, which
+    makes a prefix search two bisections, and each sort order is built on
+    first use and then sliced for every page until the data changes again.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._tallies = None
+
+    def _reset(self, tallies):
+        self._tallies = tallies
+        self.version = None
+        self.entries = None
+        self.names = []
+        self.winnings = []
+        self.paid_raw = []
+        self.paid = []
+        self.owed = []
+        self.net = []
+        self.total_owed = 0
+        self.contrib = {}
+        self.answers = {}
+        self.orders = {}
+
+    def sync(self, conn):
+        """Catch up with the pool's data version; a no-op while it has not moved."""
+        # Read first, like ResponseCache.get(): a change that lands mid-build leaves this stale, not current.
+        version = self.pool.cache.version
+        with self._lock:
+            if self.pool.tallies is self._tallies and version == self.version:
+                return
+            self.pool.leaderboard.sync(conn)
+            tallies, entries, winnings, contrib, answers = self.pool.leaderboard.standings()
+            if tallies is not self._tallies:
+                self._reset(tallies)
+            known, count = len(self.winnings), len(winnings)
+            added = [(person["name"].casefold(), pid) for pid, person in enumerate(tallies.participants[known:count], known)]
+            if len(added) * 8 > len(self.names):
+                self.names = sorted(self.names + added)
+            else:
+                for entry in added:
+                    bisect.insort(self.names, entry)
+
+            if entries != self.entries:
+                # A repeat entry adds to an existing name's paid in, so re-read them all.
+                paid_by_name = tallies.paid_in()
+                self.paid_raw = [paid_by_name.get(person["name"], 0) for person in tallies.participants[:count]]
+                self.paid = [round(amount, 2) for amount in self.paid_raw]
+                moved = range(count)
+            else:
+                self.paid_raw.extend([0] * (count - known))
+                self.paid.extend([0] * (count - known))
+                moved = [pid for pid, (new, old) in enumerate(zip(winnings, self.winnings)) if new != old]
+                moved.extend(range(known, count))
+            self.owed.extend([0.0] * (count - known))
+            self.net.extend([0.0] * (count - known))
+            for pid in moved:
+                self.owed[pid] = round(winnings[pid], 2)
+                self.net[pid] = round(winnings[pid] - self.paid_raw[pid], 2)
+            self.total_owed = round(sum(self.owed), 2)
+            self.winnings = winnings
+            self.entries = entries
+            self.contrib = contrib
+            self.answers = answers
+            self.orders = {}
+            self.version = version
+
+    def _order(self, sort, descending):
+        key = (sort, descending)
+        if key not in self.orders:
+            by_name = [pid for _, pid in self.names]
+            if sort == "name":
+                self.orders[key] = by_name[::-1] if descending else by_name
+            else:
+                # Stable, so ties stay in name order either way.
+                self.orders[key] = sorted(by_name, key=self._column(sort).__getitem__, reverse=descending)
+        return self.orders[key]
+
+    def _column(self, sort):
+        return {"net": self.net, "owed": self.owed, "paidIn": self.paid}[sort]
+
+    def page(self, conn, sort="net", descending=True, prefix="", offset=0, limit=LEDGER_PAGE_SIZE):
+        """One page of ledger rows, sorted by `sort`, optionally only names starting with `prefix`."""
+        self.sync(conn)
+        with self._lock:
+            if prefix:
+                folded = prefix.casefold()
+                lo = bisect.bisect_left(self.names, (folded,))
+                hi = bisect.bisect_left(self.names, (folded + "\U0010ffff",))
+                ordered = [pid for _, pid in self.names[lo:hi]]
+                if sort == "name":
+                    if descending:
+                        ordered.reverse()
+                else:
+                    ordered.sort(key=self._column(sort).__getitem__, reverse=descending)
+            else:
+                ordered = self._order(sort, descending)
+            rows = []
+            for pid in ordered[offset : offset + limit]:
+                person = self._tallies.participants[pid]
+                rows.append(
+                    {
+                        "name": person["name"],
+                        "initials": person["initials"],
+                        "color": person["color"],
+                        "paidIn": self.paid[pid],
+                        "owed": self.owed[pid],
+                        "net": self.net[pid],
+                    }
+                )
+            return {
+                "rows": rows,
+                "total": len(ordered),
+                "participants": len(self.names),
+                "offset": offset,
+                "limit": limit,
+                "sort": sort,
+                "order": "desc" if descending else "asc",
+            }
+
+    def summary(self, conn):
+        """Totals, the per-question breakdown and the squares board, without a row per person."""
+        self.sync(conn)
+        board = get_square_board(conn)
+        selections = list_square_selections(conn, identity=self.pool.tallies.identity)
+        squares_calc = calculate_squares_winners(None, board, selections)
+        with self._lock:
+            participants = self._tallies.participants
+            answered_counts = self._tallies.answered_counts()
+            question_breakdown = []
+            for q in self.pool.questions:
+                winners, split = self.contrib.get(q["id"], (frozenset(), 0))
+                question_breakdown.append(
+                    {
+                        "questionId": q["id"],
+                        "text": q["text"],
+                        "collected": q["cost"] * answered_counts.get(q["id"], 0),
+                        "correctAnswer": self.answers.get(q["id"]),
+                        "winners": heapq.nsmallest(LEDGER_WINNER_PREVIEW, (participants[pid]["name"] for pid in winners)),
+                        "winnerCount": len(winners),
+                        "splitAmount": round(split, 2),
+                    }
+                )
+            total_owed = self.total_owed
+            answers = dict(self.answers)
+            count = len(self.names)
+        total_collected = round(sum(item["collected"] for item in question_breakdown) + squares_calc["pot"], 2)
+        return {
+            "correctAnswers": answers,
+            "questionBreakdown": question_breakdown,
+            "participants": count,
+            "totalCollected": total_collected,
+            "totalOwed": total_owed,
+            "houseRemainder": round(total_collected - total_owed, 2),
+            "squares": {
+                "board": build_squares_revealed(self.pool, None, board, selections),
+                "scores": board["scores"],
+                "pot": squares_calc["pot"],
+                "quarterShare": squares_calc["quarterShare"],
+                "quarters": squares_calc["quarters"],
+            },
+        }
+
+
+def read_data_version(conn):
+    return conn.execute("SELECT version FROM data_changes WHERE id = 1").fetchone()[0]
+
+
+def validate_questions(raw):
+    """Check a pool's question set and return it with only the keys the app reads."""
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("A pool needs at least one question.")
+    questions = []
+    seen = set()
+    for item in raw:
+        if not isinstance(item, dict):
+            raise ValueError("Each question must be an object.")
+        qid = item.get("id")
+        if not isinstance(qid, int) or isinstance(qid, bool) or qid < 1 or qid in seen:
+            raise ValueError("Question ids must be unique positive integers.")
+        text = str(item.get("text") or "").strip()
+        if not text:
+            raise ValueError(f"Q{qid} needs text.")
+        cost = item.get("cost", 1)
+        if not isinstance(cost, (int, float)) or isinstance(cost, bool) or cost < 0:
+            raise ValueError(f"Q{qid} has an invalid cost.")
+        question = {"id": qid, "text": text, "type": item.get("type"), "cost": cost}
+        if question["type"] == "radio":
+            options = item.get("options")
+            if not isinstance(options, list) or not options or not all(isinstance(o, str) and o.strip() for o in options):
+                raise ValueError(f"Q{qid} needs a list of options.")
+            question["options"] = [o.strip() for o in options]
+        elif question["type"] == "numeric":
+            low, high = item.get("min", 0), item.get("max", 1000)
+            if not all(isinstance(v, int) and not isinstance(v, bool) for v in (low, high)) or low > high:
+                raise ValueError(f"Q{qid} needs an integer min and max.")
+            question["min"], question["max"] = low, high
+            if item.get("suffix"):
+                question["suffix"] = str(item["suffix"])
+        else:
+            raise ValueError(f"Q{qid} must be a radio or numeric question.")
+        seen.add(qid)
+        questions.append(question)
+    return questions
+
+
+def load_questions(path):
+    """Read and validate a question list from a JSON file; raises OSError or ValueError."""
+    with open(path, encoding="utf-8") as fh:
+        return validate_questions(json.load(fh))
+
+
+QUESTIONS = load_questions(QUESTIONS_PATH)
+
+
+class QuestionCatalog:
+    """A pool's validated questions compiled for the request path.
+
+    Answers are checked against a frozenset of options or a (min, max) pair
+    looked up by question id, and the /api/questions body is serialized,
+    compressed and tagged once here instead of on every page load. A catalog
+    never changes; a reload builds a new one and swaps it in.
+    """
+
+    def __init__(self, questions, pool_id, pool_name):
+        self.questions = questions
+        self.by_key = {str(q["id"]): q for q in questions}
+        self._rules = {q["id"]: frozenset(q["options"]) if q["type"] == "radio" else (q["min"], q["max"]) for q in questions}
+        self.body = json.dumps({"pool": {"id": pool_id, "name": pool_name}, "questions": questions}).encode("utf-8")
+        self.etag = content_etag(self.body)
+        self.variants = {"gzip": compress(self.body, "gzip")}
+        if brotli is not None:
+            self.variants["br"] = compress(self.body, "br")
+
+    def validate(self, question, answer):
+        """Return answer normalized for storage, or None if blank; raises ValueError if it is invalid."""
+        if answer is None:
+            return None
+        if isinstance(answer, str):
+            answer = answer.strip()
+            if answer == "":
+                return None
+        rule = self._rules[question["id"]]
+        if isinstance(rule, frozenset):
+            if not isinstance(answer, str):
+                raise ValueError("Multiple choice answer must be text")
+            if answer not in rule:
+                raise ValueError(f"Invalid option for Q{question['id']}")
+            return answer
+
+        if isinstance(answer, bool):
+            raise ValueError("Numeric answer must be an integer")
+        if isinstance(answer, str):
+            if not answer.isdigit():
+                raise ValueError("Numeric answer must be an integer")
+            value = int(answer)
+        elif isinstance(answer, int):
+            value = answer
+        else:
+            raise ValueError("Numeric answer must be an integer")
+        low, high = rule
+        if value < low or value > high:
+            raise ValueError(f"Answer for Q{question['id']} must be between {low} and {high}")
+        return str(value)
+
+
+def tally_shape(questions):
+    """What AnswerTallies indexes by: a change here needs a rescan, anything else is a relabel."""
+    return [(q["id"], q["type"], tuple(q.get("options", ()))) for q in questions]
+
+
+class Pool:
+    """One betting pool: its database file, question set, admin password and in-memory indexes."""
+
+    def __init__(self, pool_id, name, db_path, questions, admin_password):
+        self.id = pool_id
+        self.name = name
+        self.db_path = db_path
+        self.questions = questions
+        self.catalog = QuestionCatalog(questions, pool_id, name)
+        self.admin_password = admin_password
+        self.cache = ResponseCache()
+        self.tallies = AnswerTallies(questions)
+        self.occupancy = SquareOccupancy(self.tallies)
+        self.writer = SubmissionWriter(db_path)
+        self.leaderboard = Leaderboard(self)
+        self.ledger = Ledger(self)
+        self.data_version = None
+        self.announced_version = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def snapshot_path(self):
+        return self.db_path + ".snapshot"
+
+    def refresh(self, conn=None, local=False):
+        """Drop cached responses if the pool's database changed since the last look.
+
+        data_changes.version is bumped by triggers on every table the API
+        reads, so this catches commits from other worker processes and
+        command-line tools as well as this process's own. Write paths call it
+        with local=True after committing, which also marks the change as
+        announced through their own stream event. Returns whether anything changed.
+        """
+        if conn is None:
+            conn = get_db(self.db_path)
+            version = read_data_version(conn)
+            release_db(conn)
+        else:
+            version = read_data_version(conn)
+        with self._refresh_lock:
+            if local:
+                self.announced_version = version
+            if version == self.data_version:
+                return False
+            self.data_version = version
+        self.cache.bump()
+        return True
+
+    def unannounced_change(self, conn):
+        """True once for each database change no stream event has covered yet (see ChangeMonitor)."""
+        version = read_data_version(conn)
+        with self._refresh_lock:
+            if version == self.announced_version:
+                return False
+            self.announced_version = version
+            return True
+
+    def set_questions(self, questions):
+        """Switch the pool to a new question set while it keeps serving.
+
+        Requests already running finish with the catalog and tallies they
+        started with. If options or question ids changed, fresh tallies are
+        built from the database on the calling thread before being swapped in.
+        """
+        catalog = QuestionCatalog(questions, self.id, self.name)
+        if tally_shape(questions) == tally_shape(self.questions):
+            self.tallies.relabel(questions)
+        else:
+            tallies = AnswerTallies(questions)
+            conn = get_db(self.db_path)
+            try:
+                tallies.sync(conn)
+            finally:
+                release_db(conn)
+            self.tallies = tallies
+            self.occupancy.tallies = tallies
+        self.questions = questions
+        self.catalog = catalog
+        self.cache.bump()
+
+    def warm(self):
+        """Bring the tallies and square occupancy up to date, starting from the snapshot when it fits.
+
+        Returns whether the snapshot was used; either way only rows newer than
+        what is loaded are read from the database.
+        """
+        conn = get_db(self.db_path)
+        # Read before syncing: anything committed after this only makes the caches look older than they are.
+        self.data_version = self.announced_version = read_data_version(conn)
+        snapshot = self.restore_snapshot(conn)
+        self.tallies.sync(conn)
+        self.occupancy.sync(conn)
+        release_db(conn)
+        if snapshot is None:
+            return False
+        saved = snapshot["tallies"]
+        if (self.tallies.last_submission_id, self.tallies.last_answer_id) == (saved["last_submission_id"], saved["last_answer_id"]):
+            self.cache.seed("results", snapshot["results"])
+        return True
+
+    def save_snapshot(self):
+        """Write the in-memory indexes next to the database so a restart can skip the full scan."""
+        tallies = self.tallies.state()
+        results = json.dumps(tallies.pop("results")).encode("utf-8")
+        occupancy = self.occupancy.state()
+        conn = connect_db(self.db_path)
+        try:
+            fingerprint = snapshot_fingerprint(conn, tallies, occupancy)
+        finally:
+            conn.close()
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "questions": self.questions,
+            "fingerprint": fingerprint,
+            "tallies": tallies,
+            "occupancy": occupancy,
+            "results": results,
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def restore_snapshot(self, conn):
+        """Load the snapshot into the tallies and occupancy if it still matches the database; returns it, or None."""
+        try:
+            with open(self.snapshot_path, "rb") as fh:
+                data = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A damaged snapshot only costs the shortcut; the full scan still works.
+            return None
+        if data.get("version") != SNAPSHOT_VERSION or data.get("questions") != self.questions:
+            return None
+        if snapshot_fingerprint(conn, data["tallies"], data["occupancy"]) != data["fingerprint"]:
+            return None
+        self.tallies.restore(data["tallies"])
+        self.occupancy.restore(data["occupancy"])
+        return data
+
+
+def snapshot_fingerprint(conn, tallies, occupancy):
+    """Rows that tie a snapshot to the database it was taken from.
+
+    The tables are append-only, so if the last row folded into each index is
+    unchanged and the submission count up to it still matches, everything
+    before it is too. A restored backup or a different file fails the check.
+    """
+
+    def row(sql, row_id):
+        if not row_id:
+            return None
+        found = conn.execute(sql, (row_id,)).fetchone()
+        return tuple(found) if found is not None else ()
+
+    return (
+        conn.execute("SELECT COUNT(*) FROM submissions WHERE id <= ?", (tallies["last_submission_id"],)).fetchone()[0],
+        row("SELECT full_name, total_owed, created_at FROM submissions WHERE id = ?", tallies["last_submission_id"]),
+        row("SELECT submission_id, question_id, answer_text FROM answers WHERE id = ?", tallies["last_answer_id"]),
+        row("SELECT submission_id, row_idx, col_idx FROM square_selections WHERE id = ?", occupancy["last_selection_id"]),
+    )
+
+
+class PoolRegistry:
+    """Every pool this server hosts, listed in the pools table of the DB_PATH database.
+
+    The default pool is the original board: DB_PATH itself with the questions
+    from QUESTIONS_PATH and ADMIN_PASSWORD. Every other pool gets its own file under pools/ next to
+    DB_PATH, so pools never contend for one write lock, and is loaded on first
+    use; an idle pool costs a table row.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def reset(self):
+        with self._lock:
+            self._pools = {}
+
+    def init(self):
+        conn = connect_db(DB_PATH)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pools (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                admin_password TEXT NOT NULL,
+                questions_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+    def path_for(self, pool_id):
+        return os.path.join(os.path.dirname(DB_PATH), "pools", f"{pool_id}.db")
+
+    def default(self):
+        pool = self._pools.get(DEFAULT_POOL_ID)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(DEFAULT_POOL_ID)
+                if pool is None:
+                    pool = self._pools[DEFAULT_POOL_ID] = Pool(DEFAULT_POOL_ID, "Super Bowl", DB_PATH, QUESTIONS, ADMIN_PASSWORD)
+        return pool
+
+    def get(self, pool_id):
+        """Return the pool called pool_id, or None if there is no such pool."""
+        if pool_id == DEFAULT_POOL_ID:
+            return self.default()
+        pool = self._pools.get(pool_id)
+        if pool is not None or not POOL_ID_PATTERN.match(pool_id):
+            return pool
+        conn = get_db()
+        row = conn.execute("SELECT id, name, admin_password, questions_json FROM pools WHERE id = ?", (pool_id,)).fetchone()
+        release_db(conn)
+        if row is None:
+            return None
+        path = self.path_for(pool_id)
+        init_db(path)
+        with self._lock:
+            pool = self._pools.get(pool_id)
+            if pool is not None:
+                return pool
+            questions = json.loads(row["questions_json"])
+            pool = self._pools[pool_id] = Pool(row["id"], row["name"], path, questions, row["admin_password"])
+        pool.warm()
+        return pool
+
+    def loaded(self):
+        with self._lock:
+            return list(self._pools.values())
+
+    def create(self, pool_id, name, admin_password, questions=None):
+        """Register a new pool and create its database; raises ValueError on bad input."""
+        pool_id = str(pool_id or "").strip().lower()
+        if not POOL_ID_PATTERN.match(pool_id) or pool_id == DEFAULT_POOL_ID:
+            raise ValueError("Pool ids are 1-40 lowercase letters, digits or dashes.")
+        name = str(name or "").strip() or pool_id
+        admin_password = str(admin_password or "")
+        if not admin_password:
+            raise ValueError("A pool needs an admin password.")
+        questions = validate_questions(self.default().questions if questions is None else questions)
+        init_db(self.path_for(pool_id))
+        conn = get_db()
+        try:
+            conn.execute(
+                "INSERT INTO pools(id, name, admin_password, questions_json, created_at) VALUES (?, ?, ?, ?, ?)",
+                (pool_id, name, admin_password, json.dumps(questions), datetime.utcnow().isoformat(timespec="seconds") + "Z"),
+            )
+            conn.commit()
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A pool called {pool_id} already exists.")
+        finally:
+            release_db(conn)
+        return self.get(pool_id)
+
+    def list(self):
+        conn = get_db()
+        rows = conn.execute("SELECT id, name, created_at FROM pools ORDER BY id").fetchall()
+        release_db(conn)
+        return [{"id": r["id"], "name": r["name"], "createdAt": r["created_at"]} for r in rows]
+
+
+POOLS = PoolRegistry()
+
+
+def backup_root():
+    return os.path.join(os.path.dirname(DB_PATH), "backups")
+
+
+def backup_database(src_path, dest_path):
+    """Copy a live database file with SQLite's online backup API.
+
+    The copy runs in one step inside a single read transaction. Under WAL
+    that blocks neither readers nor writers, and the result is a consistent
+    snapshot; a stepwise copy would restart every time a write landed. It is
+    written under a temporary name so a crash never leaves half a backup.
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = dest_path + ".tmp"
+    src = connect_db(src_path)
+    dest = sqlite3.connect(tmp_path)
+    try:
+        src.backup(dest)
+    finally:
+        dest.close()
+        src.close()
+    os.replace(tmp_path, dest_path)
+
+
+def list_backups(root=None):
+    root = root or backup_root()
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if os.path.exists(os.path.join(root, name, os.path.basename(DB_PATH))))
+
+
+def take_backup(root=None, keep=BACKUP_KEEP):
+    """Back up the main database and every pool's into a new timestamped directory; returns its path.
+
+    Only the newest `keep` backups are kept.
+    """
+    root = root or backup_root()
+    target = os.path.join(root, datetime.utcnow().strftime("%Y%m%d-%H%M%S"))
+    backup_database(DB_PATH, os.path.join(target, os.path.basename(DB_PATH)))
+    conn = connect_db(DB_PATH)
+    pool_ids = [r["id"] for r in conn.execute("SELECT id FROM pools")]
+    conn.close()
+    for pool_id in pool_ids:
+        if os.path.exists(POOLS.path_for(pool_id)):
+            backup_database(POOLS.path_for(pool_id), os.path.join(target, "pools", f"{pool_id}.db"))
+    for stale in list_backups(root)[:-keep] if keep else []:
+        shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+    return target
+
+
+def restore_backup(source, pool_id=None):
+    """Copy a backup directory (or one backed-up .db file) over the live databases.
+
+    With pool_id only that pool is restored. The server must be stopped
+    first: its in-memory indexes would not match the restored files. Stale
+    warm-start snapshots are removed. Returns the paths written.
+    """
+    if os.path.isdir(source):
+        if pool_id in (None, DEFAULT_POOL_ID):
+            pairs = [(os.path.join(source, os.path.basename(DB_PATH)), DB_PATH)]
+        else:
+            pairs = [(os.path.join(source, "pools", f"{pool_id}.db"), POOLS.path_for(pool_id))]
+        pools_dir = os.path.join(source, "pools")
+        if pool_id is None and os.path.isdir(pools_dir):
+            for name in sorted(os.listdir(pools_dir)):
+                if name.endswith(".db"):
+                    pairs.append((os.path.join(pools_dir, name), POOLS.path_for(name[: -len(".db")])))
+    else:
+        pairs = [(source, DB_PATH if pool_id in (None, DEFAULT_POOL_ID) else POOLS.path_for(pool_id))]
+    for backup_path, live_path in pairs:
+        if not os.path.exists(backup_path):
+            raise ValueError(f"No backup at {backup_path}.")
+    for backup_path, live_path in pairs:
+        os.makedirs(os.path.dirname(live_path), exist_ok=True)
+        src = sqlite3.connect(backup_path)
+        dest = connect_db(live_path)
+        try:
+            src.backup(dest)
+        finally:
+            dest.close()
+            src.close()
+        for stale in (live_path + ".snapshot",):
+            if os.path.exists(stale):
+                os.remove(stale)
+    return [live_path for _, live_path in pairs]
+
+
+class BackupScheduler:
+    """Takes a backup every `interval` seconds and refreshes each loaded pool's warm-start snapshot."""
+
+    def __init__(self, interval=BACKUP_INTERVAL, root=None, keep=BACKUP_KEEP):
+        self.interval = interval
+        self.root = root
+        self.keep = keep
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="backups", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                take_backup(self.root, self.keep)
+                for pool in POOLS.loaded():
+                    pool.save_snapshot()
+            except (OSError, sqlite3.Error) as err:
+                print(f"Backup failed: {err}", file=sys.stderr)
+
+
+class QuestionWatcher:
+    """Reloads the default pool's questions when QUESTIONS_PATH changes on disk.
+
+    The file is polled every `interval` seconds. An edit that does not parse or
+    validate is reported and ignored, and the current questions stay in place
+    until the file is fixed.
+    """
+
+    def __init__(self, path=None, interval=QUESTIONS_POLL_INTERVAL):
+        self.path = path or QUESTIONS_PATH
+        self.interval = interval
+        # The first check reads the file once, which also catches edits made
+        # while a prefork child was being restarted from older questions.
+        self._seen = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="questions", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self):
+        """Reload if the file changed since the last look; returns whether new questions went live."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._seen:
+            return False
+        self._seen = stamp
+        try:
+            questions = load_questions(self.path)
+        except (OSError, ValueError) as err:
+            print(f"Keeping the current questions; {self.path} is invalid: {err}", file=sys.stderr)
+            return False
+        pool = POOLS.default()
+        if questions == pool.questions:
+            return False
+        pool.set_questions(questions)
+        BROKER.publish(pool.id, "questions", {"count": len(questions)})
+        print(f"Reloaded {len(questions)} questions from {self.path}", file=sys.stderr)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except sqlite3.Error as err:
+                print(f"Question reload failed: {err}", file=sys.stderr)
+
+
+class ChangeMonitor:
+    """Tells this process's /api/stream viewers about commits made by someone else.
+
+    A submission taken by another worker process, or an import run from the
+    command line, never passes through this process's broker. Every `interval`
+    seconds each pool with live viewers has its data_changes version compared
+    with the last one announced, and a "refresh" event goes out when it moved.
+    """
+
+    def __init__(self, interval=CHANGE_POLL_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="changes", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        topics = BROKER.topics()
+        for pool in POOLS.loaded():
+            if pool.id not in topics:
+                continue
+            conn = get_db(pool.db_path)
+            unannounced = pool.unannounced_change(conn)
+            release_db(conn)
+            if unannounced:
+                BROKER.publish(pool.id, "refresh", {})
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except sqlite3.Error as err:
+                print(f"Change check failed: {err}", file=sys.stderr)
+
+
+def build_results(pool, conn):
+    with METRICS.phase("db"):
+        pool.tallies.sync(conn)
+    with METRICS.phase("aggregate"):
+        return pool.tallies.results_snapshot()
+
+
+def build_results_summary(pool, conn):
+    with METRICS.phase("db"):
+        pool.tallies.sync(conn)
+    with METRICS.phase("aggregate"):
+        return pool.tallies.results_summary()
+
+
+def parse_results_query(params):
+    """Keyword arguments for AnswerTallies.question_page() from ?option=&cursor=&limit=."""
+    try:
+        limit = int(params.get("limit", [str(RESULTS_PAGE_SIZE)])[0])
+    except ValueError:
+        raise ValueError("limit must be a whole number.") from None
+    if not 1 <= limit <= RESULTS_MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {RESULTS_MAX_PAGE_SIZE}.")
+    return {
+        "option": params.get("option", [None])[0],
+        "cursor": params.get("cursor", [None])[0],
+        "limit": limit,
+    }
+
+
+def calculate_squares_winners(conn, board=None, selections=None):
+    board = board or get_square_board(conn)
+    if selections is None:
+        selections = list_square_selections(conn, identity=person_identity)
+    pot = SQUARES_COST * len(selections)
+    quarter_share = round(pot / 4, 2)
+
+    sel_map = {(s["row"], s["col"]): s for s in selections}
+
+    payouts = {}
+    quarter_results = {}
+    for quarter_key in ["q1", "q2", "q3", "q4"]:
+        p_score = board["scores"][quarter_key]["patriots"]
+        s_score = board["scores"][quarter_key]["seahawks"]
+        result = {
+            "patriots": p_score,
+            "seahawks": s_score,
+            "winner": None,
+            "cell": None,
+            "amount": quarter_share,
+        }
+
+        if p_score is not None and s_score is not None:
+            p_digit = p_score % 10
+            s_digit = s_score % 10
+            try:
+                row_idx = board["rowDigits"].index(s_digit)
                 col_idx = board["colDigits"].index(p_digit)
                 result["cell"] = {"row": row_idx, "col": col_idx, "seahawksDigit": s_digit, "patriotsDigit": p_digit}
                 winner = sel_map.get((row_idx, col_idx))
@@ -416,44 +2499,81 @@ def calculate_squares_winners(conn):
     }
 
 
-def build_admin_payload(conn):
-    correct_rows = conn.execute("SELECT question_id, answer_text FROM correct_answers").fetchall()
-    correct_map = {r["question_id"]: r["answer_text"] for r in correct_rows}
+def nearest_values(below, above, target):
+    """The guess values at the smallest distance from target, given the nearest guess on each side."""
+    candidates = [value for value in (below, above) if value is not None]
+    if not candidates:
+        return []
+    best = min(abs(value - target) for value in candidates)
+    return sorted({value for value in candidates if abs(value - target) == best})
+
+
+def closest_guesses(conn, question_id, target):
+    """Return (winning values, names) for the guesses nearest target on a numeric question.
+
+    Two seeks on idx_answers_question_num find the nearest guess at or below
+    target and at or above it. Every guess at the winning distance, on either
+    side, shares the pot, so both values are kept on a tie.
+    """
+    below = conn.execute(
+        "SELECT answer_num FROM answers WHERE question_id = ? AND answer_num <= ? ORDER BY answer_num DESC LIMIT 1",
+        (question_id, target),
+    ).fetchone()
+    above = conn.execute(
+        "SELECT answer_num FROM answers WHERE question_id = ? AND answer_num >= ? ORDER BY answer_num LIMIT 1",
+        (question_id, target),
+    ).fetchone()
+    values = nearest_values(below and below[0], above and above[0], target)
+    if not values:
+        return [], []
+    rows = conn.execute(
+        f"""
+        SELECT s.full_name
+        FROM answers a
+        JOIN submissions s ON s.id = a.submission_id
+        WHERE a.question_id = ? AND a.answer_num IN ({", ".join("?" * len(values))})
+        ORDER BY a.answer_num, a.id
+        """,
+        (question_id, *values),
+    ).fetchall()
+    return values, [r["full_name"] for r in rows]
+
+
+def question_winners(pool, conn, q, answer):
+    """Names that win question q if `answer` is correct, with repeats for repeat entries."""
+    if not answer:
+        return []
+    if q["type"] == "numeric":
+        try:
+            target = int(answer)
+        except ValueError:
+            return []
+        return closest_guesses(conn, q["id"], target)[1]
+    return pool.tallies.option_names(q["id"], answer)
+
+
+def build_admin_payload(pool, conn):
+    with METRICS.phase("db"):
+        correct_rows = conn.execute("SELECT question_id, answer_text FROM correct_answers").fetchall()
+        correct_map = {r["question_id"]: r["answer_text"] for r in correct_rows}
+        pool.tallies.sync(conn)
+        winners = {q["id"]: question_winners(pool, conn, q, correct_map.get(q["id"])) for q in pool.questions}
+        board = get_square_board(conn)
+        selections = list_square_selections(conn, identity=pool.tallies.identity)
+    with METRICS.phase("aggregate"):
+        return score_admin_payload(pool, correct_map, winners, board, selections)
 
+
+def score_admin_payload(pool, correct_map, winners_by_question, board, selections):
     payout_by_name = {}
     question_breakdown = []
 
-    for q in QUESTIONS:
+    answered_counts = pool.tallies.answered_counts()
+    for q in pool.questions:
+        answered = answered_counts[q["id"]]
+        winners = winners_by_question.get(q["id"], [])
         c_answer = correct_map.get(q["id"])
-        rows = conn.execute(
-            """
-            SELECT s.full_name, a.answer_text
-            FROM answers a
-            JOIN submissions s ON s.id = a.submission_id
-            WHERE a.question_id = ?
-            """,
-            (q["id"],),
-        ).fetchall()
-
-        collected = q["cost"] * len(rows)
-        winners = []
-        if c_answer and rows:
-            if q["type"] == "numeric":
-                try:
-                    target = int(c_answer)
-                    dist = []
-                    for row in rows:
-                        try:
-                            dist.append((abs(int(row["answer_text"]) - target), row["full_name"]))
-                        except ValueError:
-                            continue
-                    if dist:
-                        best = min(d[0] for d in dist)
-                        winners = [n for d, n in dist if d == best]
-                except ValueError:
-                    winners = []
-            else:
-                winners = [row["full_name"] for row in rows if row["answer_text"] == c_answer]
+        collected = q["cost"] * answered
 
         unique_winners = sorted(set(winners))
         split = (collected / len(unique_winners)) if unique_winners else 0
@@ -471,24 +2591,23 @@ def build_admin_payload(conn):
             }
         )
 
-    squares = build_squares_revealed(conn)
-    squares_calc = calculate_squares_winners(conn)
+    squares = build_squares_revealed(pool, None, board, selections)
+    squares_calc = calculate_squares_winners(None, board, selections)
     for name, amount in squares_calc["payoutByName"].items():
         payout_by_name[name] = payout_by_name.get(name, 0) + amount
 
-    paid_rows = conn.execute("SELECT full_name, SUM(total_owed) AS total_paid FROM submissions GROUP BY full_name").fetchall()
-    paid_map = {r["full_name"]: float(r["total_paid"] or 0) for r in paid_rows}
+    paid_map = pool.tallies.paid_in()
 
     everyone = sorted(set(list(payout_by_name.keys()) + list(paid_map.keys())))
     by_person = []
-    for person in everyone:
+    for person, identity in zip(everyone, pool.tallies.identities(everyone)):
         paid_in = paid_map.get(person, 0)
         owed = float(payout_by_name.get(person, 0))
         by_person.append(
             {
                 "name": person,
-                "initials": initials(person),
-                "color": color_for_name(person),
+                "initials": identity["initials"],
+                "color": identity["color"],
                 "paidIn": round(paid_in, 2),
                 "owed": round(owed, 2),
                 "net": round(owed - paid_in, 2),
@@ -507,7 +2626,7 @@ def build_admin_payload(conn):
         "houseRemainder": round(total_collected - total_owed, 2),
         "squares": {
             "board": squares,
-            "scores": get_square_board(conn)["scores"],
+            "scores": board["scores"],
             "pot": squares_calc["pot"],
             "quarterShare": squares_calc["quarterShare"],
             "quarters": squares_calc["quarters"],
@@ -515,35 +2634,604 @@ def build_admin_payload(conn):
     }
 
 
-def parse_square_selections(raw):
-    if raw is None:
-        return []
-    if not isinstance(raw, list):
-        raise ValueError("Invalid square selections payload.")
+def parse_ledger_query(params):
+    """Keyword arguments for Ledger.page() from ?sort=&order=&q=&offset=&limit=."""
+    sort = params.get("sort", ["net"])[0]
+    if sort not in LEDGER_SORTS:
+        raise ValueError(f"sort must be one of {', '.join(LEDGER_SORTS)}.")
+    order = params.get("order", ["asc" if sort == "name" else "desc"])[0]
+    if order not in {"asc", "desc"}:
+        raise ValueError("order must be asc or desc.")
+    try:
+        offset = int(params.get("offset", ["0"])[0])
+        limit = int(params.get("limit", [str(LEDGER_PAGE_SIZE)])[0])
+    except ValueError:
+        raise ValueError("offset and limit must be whole numbers.") from None
+    if offset < 0 or not 1 <= limit <= LEDGER_MAX_PAGE_SIZE:
+        raise ValueError(f"offset must be 0 or more and limit between 1 and {LEDGER_MAX_PAGE_SIZE}.")
+    return {
+        "sort": sort,
+        "descending": order == "desc",
+        "prefix": params.get("q", [""])[0].strip(),
+        "offset": offset,
+        "limit": limit,
+    }
+
+
+def build_what_if(pool, conn, answers):
+    """Winners and split for each question if `answers` ({question id: value}) were correct.
+
+    Nothing is saved; the admin uses this to preview payouts while the game is
+    still on. Raises ValueError for unknown questions or invalid values.
+    """
+    if not isinstance(answers, dict) or not answers:
+        raise ValueError("Provide at least one answer to try.")
+    pool.tallies.sync(conn)
+    answered_counts = pool.tallies.answered_counts()
+    results = []
+    for key, raw in answers.items():
+        q = pool.catalog.by_key.get(str(key))
+        if q is None:
+            raise ValueError(f"Unknown question {key}.")
+        answer = pool.catalog.validate(q, raw)
+        if answer is None:
+            raise ValueError(f"Provide a value for Q{q['id']}.")
+        result = {"questionId": q["id"], "answer": answer}
+        if q["type"] == "numeric":
+            result["closestValues"], winners = closest_guesses(conn, q["id"], int(answer))
+        else:
+            winners = question_winners(pool, conn, q, answer)
+        unique_winners = sorted(set(winners))
+        collected = q["cost"] * answered_counts[q["id"]]
+        result.update(
+            {
+                "winners": unique_winners,
+                "collected": collected,
+                "splitAmount": round(collected / len(unique_winners), 2) if unique_winners else 0,
+            }
+        )
+        results.append(result)
+    return {"questions": results}
+
+
+def simulate_payouts(pool, conn, scenarios, people=None):
+    """Net payout per person for each of many hypothetical outcomes.
+
+    Each scenario is {"answers": {question id: value}, "scores": {quarter:
+    {patriots, seahawks}}, "label": str}, layered over the saved correct
+    answers and square scores; a blank answer clears that question. Everything
+    is scored against the pool's AnswerMatrix: each distinct (question,
+    answer) outcome becomes one column of per-person payouts, built once and
+    shared by every scenario that uses it, so a scenario costs one sum of
+    columns.
+    Each scenario's "net" lines up with the top-level "people" list, which is
+    everyone unless `people` names a subset. Raises ValueError for malformed
+    scenarios.
+    """
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("Provide at least one scenario.")
+    if len(scenarios) > SIMULATE_MAX_SCENARIOS:
+        raise ValueError(f"At most {SIMULATE_MAX_SCENARIOS} scenarios per request.")
+    with METRICS.phase("db"):
+        pool.tallies.sync(conn)
+        pool.occupancy.sync(conn)
+        saved = {r["question_id"]: r["answer_text"] for r in conn.execute("SELECT question_id, answer_text FROM correct_answers")}
+        board = get_square_board(conn)
+
+    with METRICS.phase("aggregate"):
+        matrix = pool.tallies.answer_matrix()
+        if people is None:
+            pids = list(range(len(matrix.names)))
+        elif isinstance(people, list) and all(isinstance(name, str) for name in people):
+            pids = [matrix.ids[name] for name in dict.fromkeys(people) if name in matrix.ids]
+        else:
+            raise ValueError("people must be a list of names.")
+        if len(pids) * len(scenarios) > SIMULATE_MAX_RESULTS:
+            raise ValueError("Too many people for this many scenarios; pass a shorter people list.")
+
+        catalog = pool.catalog
+        selections = pool.occupancy.taken()
+        total_collected = round(
+            sum(q["cost"] * matrix.answered[q["id"]] for q in catalog.questions) + SQUARES_COST * len(selections), 2
+        )
+        positions = {pid: position for position, pid in enumerate(pids)}
+        paid_in = [matrix.paid[pid] for pid in pids]
+        outcomes = {}
+        results = []
+        for index, scenario in enumerate(scenarios):
+            if not isinstance(scenario, dict):
+                raise ValueError(f"Scenario {index + 1} must be an object.")
+            answers = dict(saved)
+            overrides = scenario.get("answers") or {}
+            if not isinstance(overrides, dict):
+                raise ValueError(f"Scenario {index + 1}: answers must be an object.")
+            try:
+                for key, raw in overrides.items():
+                    q = catalog.by_key.get(str(key))
+                    if q is None:
+                        raise ValueError(f"Unknown question {key}.")
+                    answer = catalog.validate(q, raw)
+                    if answer is None:
+                        answers.pop(q["id"], None)
+                    else:
+                        answers[q["id"]] = answer
+                scores = dict(board["scores"])
+                if scenario.get("scores"):
+                    scores.update(parse_quarter_scores(scenario["scores"], partial=True))
+            except ValueError as err:
+                raise ValueError(f"Scenario {index + 1}: {err}") from None
+
+            columns = []
+            total_owed = 0.0
+            for q in catalog.questions:
+                answer = answers.get(q["id"])
+                if not answer:
+                    continue
+                key = (q["id"], answer)
+                if key not in outcomes:
+                    winners, split, paid_out = matrix.outcome(q, answer)
+                    column = [split if pid in winners else 0 for pid in pids] if paid_out else None
+                    outcomes[key] = (column, paid_out)
+                column, paid_out = outcomes[key]
+                if column is not None:
+                    columns.append(column)
+                    total_owed += paid_out
+            owed = list(map(sum, zip(*columns))) if columns else [0] * len(pids)
+
+            squares = calculate_squares_winners(None, dict(board, scores=scores), selections)
+            for name, amount in squares["payoutByName"].items():
+                total_owed += amount
+                position = positions.get(matrix.ids.get(name))
+                if position is not None:
+                    owed[position] += amount
+
+            net = [round(amount - paid, 2) for amount, paid in zip(owed, paid_in)]
+            results.append(
+                {
+                    "label": str(scenario.get("label") or index + 1),
+                    "totalOwed": round(total_owed, 2),
+                    "houseRemainder": round(total_collected - total_owed, 2),
+                    "quarters": {
+                        quarter: result["winner"]["name"] if result["winner"] else None
+                        for quarter, result in squares["quarters"].items()
+                    },
+                    "net": net,
+                }
+            )
+    return {"totalCollected": total_collected, "people": [matrix.names[pid] for pid in pids], "scenarios": results}
+
+
+def parse_square_selections(raw):
+    if raw is None:
+        return []
+    if not isinstance(raw, list):
+        raise ValueError("Invalid square selections payload.")
+
+    parsed = []
+    seen = set()
+    for item in raw:
+        if not isinstance(item, dict):
+            raise ValueError("Invalid square selections payload.")
+        row = item.get("row")
+        col = item.get("col")
+        if not isinstance(row, int) or not isinstance(col, int):
+            raise ValueError("Square coordinates must be integers.")
+        if row < 0 or row > 9 or col < 0 or col > 9:
+            raise ValueError("Square coordinates must be from 0 to 9.")
+        key = (row, col)
+        if key in seen:
+            continue
+        seen.add(key)
+        parsed.append({"row": row, "col": col})
+
+    if len(parsed) > SQUARES_MAX_PER_USER:
+        raise ValueError(f"You can select up to {SQUARES_MAX_PER_USER} squares.")
+    return parsed
+
+
+def normalize_submission(data, catalog=None):
+    """Validate a submission payload and return it in insertable form.
+
+    Answers are checked against `catalog`, the default pool's questions unless
+    given. Raises ValueError with a user-facing message for the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Submission payload is invalid.")
+    catalog = catalog or POOLS.default().catalog
+    full_name = str(data.get("fullName") or "").strip()
+    venmo_handle = str(data.get("venmoHandle") or "").strip()
+    phone_number = str(data.get("phoneNumber") or "").strip()
+    payment_method = str(data.get("paymentMethod") or "").strip().lower()
+    answers = data.get("answers", {})
+
+    if not full_name:
+        raise ValueError("Full name is required.")
+    if payment_method not in {"cash", "venmo"}:
+        raise ValueError("Invalid payment method.")
+    if not isinstance(answers, dict):
+        raise ValueError("Answers payload is invalid.")
+
+    squares = parse_square_selections(data.get("squareSelections", []))
+
+    normalized_answers = []
+    total_owed = 0
+    for key, q in catalog.by_key.items():
+        normalized = catalog.validate(q, answers.get(key))
+        if normalized is None:
+            continue
+        normalized_answers.append((q["id"], normalized))
+        total_owed += q["cost"]
+
+    total_owed += len(squares) * SQUARES_COST
+    return {
+        "fullName": full_name,
+        "venmoHandle": venmo_handle,
+        "phoneNumber": phone_number,
+        "paymentMethod": payment_method,
+        "answers": normalized_answers,
+        "squares": squares,
+        "totalOwed": total_owed,
+    }
+
+
+def insert_submission(conn, entry, now, submission_id=None):
+    cur = conn.execute(
+        """
+        INSERT INTO submissions(id, full_name, venmo_handle, phone_number, phone_last4, payment_method, total_owed, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            submission_id,
+            entry["fullName"],
+            entry["venmoHandle"],
+            entry["phoneNumber"],
+            phone_last4(entry["phoneNumber"]),
+            entry["paymentMethod"],
+            entry["totalOwed"],
+            now,
+        ),
+    )
+    submission_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO answers(submission_id, question_id, answer_text, answer_num) VALUES (?, ?, ?, ?)",
+        [(submission_id, qid, ans, answer_number(ans)) for qid, ans in entry["answers"]],
+    )
+    conn.executemany(
+        "INSERT INTO square_selections(submission_id, row_idx, col_idx) VALUES (?, ?, ?)",
+        [(submission_id, sq["row"], sq["col"]) for sq in entry["squares"]],
+    )
+    return submission_id
+
+
+def parse_import_records(raw, fmt):
+    """Yield (line number, submission payload) pairs from CSV or NDJSON text.
+
+    CSV columns: fullName, venmoHandle, phoneNumber, paymentMethod, one column
+    per question id (1..N, optionally written q1..qN) and squares, a list of
+    1-based row-col pairs such as "3-7; 4-2" as printed on the board.
+    """
+    if fmt == "ndjson":
+        for line_no, line in enumerate(raw.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError:
+                yield line_no, ValueError("Line is not valid JSON.")
+        return
+
+    reader = csv.DictReader(io.StringIO(raw))
+    for record in reader:
+        line_no = reader.line_num
+        row = {str(k or "").strip(): (v or "").strip() for k, v in record.items() if k is not None}
+        answers = {}
+        for key, value in row.items():
+            qid = key[1:] if key[:1] in ("q", "Q") else key
+            if qid.isdigit() and value != "":
+                answers[qid] = value
+        squares = []
+        try:
+            for pair in row.get("squares", "").replace(";", " ").replace(",", " ").split():
+                r, _, c = pair.partition("-")
+                squares.append({"row": int(r) - 1, "col": int(c) - 1})
+        except ValueError:
+            yield line_no, ValueError("Squares must be written as row-col pairs, e.g. 3-7.")
+            continue
+        yield line_no, {
+            "fullName": row.get("fullName", ""),
+            "venmoHandle": row.get("venmoHandle", ""),
+            "phoneNumber": row.get("phoneNumber", ""),
+            "paymentMethod": row.get("paymentMethod", ""),
+            "answers": answers,
+            "squareSelections": squares,
+        }
+
+
+def import_submissions(conn, records, catalog=None, partial=False, dry_run=False):
+    """Validate and insert many submissions in one write transaction.
+
+    Every record is checked with the same rules as /api/submissions, and
+    squares are checked against the board and against earlier rows of the same
+    batch. Unless `partial` is set, any rejected row means nothing is imported.
+    """
+    entries = []
+    rejected = []
+    for line_no, data in records:
+        try:
+            if isinstance(data, Exception):
+                raise data
+            entries.append((line_no, normalize_submission(data, catalog)))
+        except ValueError as err:
+            rejected.append({"row": line_no, "error": str(err)})
+
+    begin_immediate(conn)
+    try:
+        claimed = {(r["row_idx"], r["col_idx"]) for r in conn.execute("SELECT row_idx, col_idx FROM square_selections")}
+        accepted = []
+        for line_no, entry in entries:
+            cells = [(sq["row"], sq["col"]) for sq in entry["squares"]]
+            clash = next((cell for cell in cells if cell in claimed), None)
+            if clash is not None:
+                rejected.append({"row": line_no, "error": f"Square {clash[0] + 1},{clash[1] + 1} is already taken."})
+                continue
+            claimed.update(cells)
+            accepted.append(entry)
+        rejected.sort(key=lambda item: item["row"])
+
+        if dry_run or (rejected and not partial):
+            conn.rollback()
+            return {"imported": 0, "rejected": rejected, "dryRun": dry_run, "valid": len(accepted)}
+
+        now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        next_id = conn.execute(
+            "SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'submissions'), 0), COALESCE(MAX(id), 0)) + 1 FROM submissions"
+        ).fetchone()[0]
+        for start in range(0, len(accepted), IMPORT_CHUNK_SIZE):
+            chunk = list(enumerate(accepted[start:start + IMPORT_CHUNK_SIZE], start=next_id + start))
+            conn.executemany(
+                """
+                INSERT INTO submissions(id, full_name, venmo_handle, phone_number, phone_last4, payment_method, total_owed, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        sid,
+                        e["fullName"],
+                        e["venmoHandle"],
+                        e["phoneNumber"],
+                        phone_last4(e["phoneNumber"]),
+                        e["paymentMethod"],
+                        e["totalOwed"],
+                        now,
+                    )
+                    for sid, e in chunk
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO answers(submission_id, question_id, answer_text, answer_num) VALUES (?, ?, ?, ?)",
+                [(sid, qid, ans, answer_number(ans)) for sid, e in chunk for qid, ans in e["answers"]],
+            )
+            conn.executemany(
+                "INSERT INTO square_selections(submission_id, row_idx, col_idx) VALUES (?, ?, ?)",
+                [(sid, sq["row"], sq["col"]) for sid, e in chunk for sq in e["squares"]],
+            )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return {"imported": len(accepted), "rejected": rejected, "dryRun": False, "valid": len(accepted)}
+
+
+def _by_submission(conn, sql):
+    """Run sql, ordered by submission_id (its first column), and yield (submission_id, rows) groups.
+
+    Rows come back as plain tuples; building sqlite3.Row objects for every
+    answer roughly doubles the cost of a large export.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return ((sid, list(rows)) for sid, rows in itertools.groupby(cursor.execute(sql), key=lambda r: r[0]))
+
+
+def export_submissions(pool, conn):
+    """One row per submission with answers pivoted into q<id> columns and squares as row-col pairs.
+
+    The columns are the ones parse_import_records reads, so a CSV export can be
+    imported into another pool unchanged. Submissions, answers and squares are
+    read by three cursors in submission order and merged as they stream.
+    """
+    columns = ["submissionId", "createdAt", "fullName", "venmoHandle", "phoneNumber", "paymentMethod", "totalOwed"]
+    columns += [f"q{q['id']}" for q in pool.questions] + ["squares"]
+    answer_columns = {q["id"]: f"q{q['id']}" for q in pool.questions}
+
+    def rows():
+        answers = _by_submission(conn, "SELECT submission_id, question_id, answer_text FROM answers ORDER BY submission_id, id")
+        squares = _by_submission(conn, "SELECT submission_id, row_idx, col_idx FROM square_selections ORDER BY submission_id, id")
+        next_answers = next(answers, None)
+        next_squares = next(squares, None)
+        submissions = conn.execute(
+            "SELECT id, created_at, full_name, venmo_handle, phone_number, payment_method, total_owed FROM submissions ORDER BY id"
+        )
+        for sub in submissions:
+            row = {
+                "submissionId": sub["id"],
+                "createdAt": sub["created_at"],
+                "fullName": sub["full_name"],
+                "venmoHandle": sub["venmo_handle"] or "",
+                "phoneNumber": sub["phone_number"] or "",
+                "paymentMethod": sub["payment_method"],
+                "totalOwed": sub["total_owed"],
+            }
+            while next_answers is not None and next_answers[0] < sub["id"]:
+                next_answers = next(answers, None)
+            if next_answers is not None and next_answers[0] == sub["id"]:
+                for _, qid, answer_text in next_answers[1]:
+                    if qid in answer_columns:
+                        row[answer_columns[qid]] = answer_text
+            while next_squares is not None and next_squares[0] < sub["id"]:
+                next_squares = next(squares, None)
+            if next_squares is not None and next_squares[0] == sub["id"]:
+                row["squares"] = "; ".join(f"{r + 1}-{c + 1}" for _, r, c in next_squares[1])
+            else:
+                row["squares"] = ""
+            yield row
+
+    return columns, rows()
+
+
+def export_squares(pool, conn):
+    """One row per sold square, with its board digits and the quarters it has won so far."""
+    columns = ["row", "col", "seahawksDigit", "patriotsDigit", "quartersWon", "submissionId", "fullName", "venmoHandle"]
+    board = get_square_board(conn)
+    won = {}
+    for quarter, score in board["scores"].items():
+        if score["patriots"] is not None and score["seahawks"] is not None:
+            cell = (board["rowDigits"].index(score["seahawks"] % 10), board["colDigits"].index(score["patriots"] % 10))
+            won.setdefault(cell, []).append(quarter)
+
+    def rows():
+        cursor = conn.execute(
+            """
+            SELECT sq.row_idx, sq.col_idx, s.id, s.full_name, s.venmo_handle
+            FROM square_selections sq
+            JOIN submissions s ON s.id = sq.submission_id
+            ORDER BY sq.row_idx, sq.col_idx
+            """
+        )
+        for r in cursor:
+            yield {
+                "row": r["row_idx"] + 1,
+                "col": r["col_idx"] + 1,
+                "seahawksDigit": board["rowDigits"][r["row_idx"]],
+                "patriotsDigit": board["colDigits"][r["col_idx"]],
+                "quartersWon": "; ".join(won.get((r["row_idx"], r["col_idx"]), [])),
+                "submissionId": r["id"],
+                "fullName": r["full_name"],
+                "venmoHandle": r["venmo_handle"] or "",
+            }
+
+    return columns, rows()
+
+
+def export_payouts(pool, conn):
+    """One row per person: what they paid by cash and Venmo, what they are owed and the net."""
+    columns = ["name", "venmoHandle", "paidCash", "paidVenmo", "paidIn", "owed", "net"]
+    owed = {p["name"]: p["owed"] for p in build_admin_payload(pool, conn)["byPerson"]}
+
+    def rows():
+        cursor = conn.execute(
+            """
+            SELECT full_name,
+                   MAX(venmo_handle) AS venmo_handle,
+                   SUM(CASE WHEN payment_method = 'cash' THEN total_owed ELSE 0 END) AS paid_cash,
+                   SUM(CASE WHEN payment_method = 'venmo' THEN total_owed ELSE 0 END) AS paid_venmo,
+                   SUM(total_owed) AS paid_in
+            FROM submissions
+            GROUP BY full_name
+            ORDER BY full_name
+            """
+        )
+        for r in cursor:
+            amount = owed.get(r["full_name"], 0.0)
+            yield {
+                "name": r["full_name"],
+                "venmoHandle": r["venmo_handle"] or "",
+                "paidCash": round(float(r["paid_cash"]), 2),
+                "paidVenmo": round(float(r["paid_venmo"]), 2),
+                "paidIn": round(float(r["paid_in"]), 2),
+                "owed": amount,
+                "net": round(amount - r["paid_in"], 2),
+            }
+
+    return columns, rows()
+
+
+EXPORTERS = {"submissions": export_submissions, "squares": export_squares, "payouts": export_payouts}
 
-    parsed = []
-    seen = set()
-    for item in raw:
-        if not isinstance(item, dict):
-            raise ValueError("Invalid square selections payload.")
-        row = item.get("row")
-        col = item.get("col")
-        if not isinstance(row, int) or not isinstance(col, int):
-            raise ValueError("Square coordinates must be integers.")
-        if row < 0 or row > 9 or col < 0 or col > 9:
-            raise ValueError("Square coordinates must be from 0 to 9.")
-        key = (row, col)
-        if key in seen:
-            continue
-        seen.add(key)
-        parsed.append({"row": row, "col": col})
 
-    if len(parsed) > SQUARES_MAX_PER_USER:
-        raise ValueError(f"You can select up to {SQUARES_MAX_PER_USER} squares.")
-    return parsed
+def encode_export(columns, rows, fmt):
+    """Turn export rows into CSV or NDJSON text, yielded in blocks of about EXPORT_CHUNK_SIZE."""
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+    for row in rows:
+        if writer is not None:
+            writer.writerow([row.get(c, "") for c in columns])
+        else:
+            buf.write(json.dumps(row) + "\n")
+        if buf.tell() >= EXPORT_CHUNK_SIZE:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
 
 
 class Handler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY small
+    # responses stall on the client's delayed ACK.
+    disable_nagle_algorithm = True
+    log_format = "access"
+    # Applies to every read and write on the socket, so a client that stalls
+    # mid-request frees its worker instead of holding it indefinitely.
+    timeout = REQUEST_TIMEOUT
+
+    def handle_one_request(self):
+        self._request_started = None
+        self._status = None
+        try:
+            super().handle_one_request()
+        finally:
+            if self._request_started is not None:
+                elapsed = time.perf_counter() - self._request_started
+                METRICS.request_finished(self.command, route_label(self.path), self._status, elapsed)
+                if self.log_format == "json":
+                    self.write_json_log(elapsed)
+
+    def parse_request(self):
+        ok = super().parse_request()
+        if ok:
+            self._request_started = time.perf_counter()
+            METRICS.request_started()
+        return ok
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def log_request(self, code="-", size="-"):
+        if self.log_format != "json":
+            super().log_request(code, size)
+
+    def log_message(self, format, *args):
+        if self.log_format != "json":
+            super().log_message(format, *args)
+            return
+        line = {"ts": datetime.utcnow().isoformat(timespec="milliseconds") + "Z", "client": self.client_address[0], "message": format % args}
+        sys.stderr.write(json.dumps(line) + "\n")
+
+    def write_json_log(self, elapsed):
+        line = {
+            "ts": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "client": self.client_address[0],
+            "method": self.command,
+            "path": self.path,
+            "route": route_label(self.path),
+            "status": self._status,
+            "durationMs": round(elapsed * 1000, 3),
+        }
+        sys.stderr.write(json.dumps(line) + "\n")
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self.server.wait_for_next_request(self.connection):
+                break
+            self.handle_one_request()
+
     def translate_path(self, path):
         parsed = urlparse(path)
         cleaned = parsed.path
@@ -553,108 +3241,339 @@ class Handler(SimpleHTTPRequestHandler):
             return cleaned
         return os.path.join(STATIC_DIR, cleaned.lstrip("/"))
 
+    def resolve_pool(self, path):
+        """Split /api/pools/<id>/... into (pool, /api/...); every other path belongs to the default pool."""
+        if not path.startswith("/api/pools/"):
+            return POOLS.default(), path
+        pool_id, _, rest = path[len("/api/pools/"):].partition("/")
+        return POOLS.get(pool_id), "/api/" + rest
+
+    def is_admin(self, pool):
+        return self.headers.get("X-Admin-Password", "") == pool.admin_password
+
+    def rate_budget(self, pool, path):
+        """The RATE_LIMITS budget this request draws from, if any."""
+        if path == "/api/admin/login":
+            return "login"
+        if path.startswith("/api/admin/"):
+            # Failed admin checks share the login budget, so the password
+            # cannot be guessed through the other admin routes instead.
+            return None if self.is_admin(pool) else "login"
+        if self.command == "POST":
+            if path == "/api/view-guesses":
+                return "view-guesses"
+            if path == "/api/submissions":
+                return "submissions"
+            if path in ("/api/squares/hold", "/api/squares/release"):
+                return "holds"
+        return None
+
+    def throttled(self, pool, path):
+        """Send 429 and return True if this client is over its budget for the route."""
+        budget = self.rate_budget(pool, path)
+        if budget is None:
+            return False
+        wait = LIMITER.acquire(self.client_address[0], budget)
+        if not wait:
+            return False
+        headers = {"Retry-After": str(max(1, math.ceil(wait)))}
+        if self.command == "POST":
+            # The body is left unread, so the connection cannot be reused.
+            headers["Connection"] = "close"
+        send_json(self, {"error": "Too many requests. Please wait a moment and try again."}, 429, headers=headers)
+        return True
+
+    def oversized(self, path):
+        """Send 413 (or 400) and return True unless Content-Length is valid and within the route's limit."""
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        limit = MAX_UPLOAD_SIZE if path in UPLOAD_PATHS else MAX_BODY_SIZE
+        if 0 <= length <= limit:
+            return False
+        if length < 0:
+            send_json(self, {"error": "Invalid Content-Length."}, 400, headers={"Connection": "close"})
+        else:
+            send_json(self, {"error": f"Request body is too large (limit {limit} bytes)."}, 413, headers={"Connection": "close"})
+        return True
+
     def do_GET(self):
         parsed = urlparse(self.path)
+        pool, path = self.resolve_pool(parsed.path)
+        if pool is None:
+            send_json(self, {"error": "Unknown pool."}, 404)
+            return
+        if self.throttled(pool, path):
+            return
 
-        if parsed.path == "/api/questions":
-            send_json(self, {"questions": QUESTIONS})
+        if path == "/api/stream":
+            self.open_event_stream(pool)
             return
 
-        if parsed.path == "/api/results":
-            conn = get_db()
-            payload = build_results(conn)
-            conn.close()
+        if path == "/api/questions":
+            catalog = pool.catalog
+            send_body(self, catalog.body, etag=catalog.etag, variants=catalog.variants)
+            return
+
+        if path == "/api/results":
+            conn = get_db(pool.db_path)
+            pool.refresh(conn)
+            body, etag, variants = pool.cache.get("results", lambda: build_results(pool, conn))
+            release_db(conn)
+            send_body(self, body, etag=etag, variants=variants)
+            return
+
+        if path == "/api/results/summary":
+            conn = get_db(pool.db_path)
+            pool.refresh(conn)
+            body, etag, variants = pool.cache.get("results-summary", lambda: build_results_summary(pool, conn))
+            release_db(conn)
+            send_body(self, body, etag=etag, variants=variants)
+            return
+
+        if path.startswith("/api/results/"):
+            # Looked up in the tallies' own question set, which a questions.json reload swaps together.
+            tallies = pool.tallies
+            key = path[len("/api/results/"):]
+            question = next((q for q in tallies.questions if str(q["id"]) == key), None)
+            if question is None:
+                send_json(self, {"error": "Unknown question."}, 404)
+                return
+            conn = get_db(pool.db_path)
+            tallies.sync(conn)
+            release_db(conn)
+            try:
+                payload = tallies.question_page(question, **parse_results_query(parse_qs(parsed.query)))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
             send_json(self, payload)
             return
 
-        if parsed.path == "/api/squares/public":
-            conn = get_db()
-            payload = build_squares_public(conn)
-            conn.close()
+        if path == "/api/leaderboard":
+            conn = get_db(pool.db_path)
+            pool.refresh(conn)
+            body, etag, variants = pool.cache.get("leaderboard", lambda: pool.leaderboard.sync(conn))
+            release_db(conn)
+            send_body(self, body, etag=etag, variants=variants)
+            return
+
+        if path == "/api/squares/public":
+            conn = get_db(pool.db_path)
+            payload = build_squares_public(pool, conn, parse_qs(parsed.query).get("token", [None])[0])
+            release_db(conn)
             send_json(self, payload)
             return
 
-        if parsed.path == "/api/squares/revealed":
-            conn = get_db()
-            payload = build_squares_revealed(conn)
-            conn.close()
+        if path == "/api/squares/revealed":
+            conn = get_db(pool.db_path)
+            payload = build_squares_revealed(pool, conn)
+            release_db(conn)
             send_json(self, payload)
             return
 
-        if parsed.path == "/api/admin/state":
-            if self.headers.get("X-Admin-Password", "") != ADMIN_PASSWORD:
+        if path == "/api/admin/metrics" and pool.id == DEFAULT_POOL_ID:
+            if not self.is_admin(pool):
                 send_json(self, {"error": "Unauthorized"}, 401)
                 return
-            conn = get_db()
-            payload = build_admin_payload(conn)
-            conn.close()
+            text = METRICS.render(
+                extra_gauges=[
+                    ("superbowl_stream_subscribers", "Live /api/stream connections.", BROKER.subscriber_count()),
+                    ("superbowl_queued_connections", "Connections waiting for a worker thread.", self.server.pending.qsize()),
+                ]
+            )
+            send_body(self, text.encode("utf-8"), content_type="text/plain; version=0.0.4; charset=utf-8")
+            return
+
+        if path == "/api/admin/state":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            conn = get_db(pool.db_path)
+            payload = build_admin_payload(pool, conn)
+            release_db(conn)
+            send_json(self, payload)
+            return
+
+        if path == "/api/admin/summary":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            conn = get_db(pool.db_path)
+            pool.refresh(conn)
+            body, etag, variants = pool.cache.get("admin-summary", lambda: pool.ledger.summary(conn))
+            release_db(conn)
+            send_body(self, body, etag=etag, variants=variants)
+            return
+
+        if path == "/api/admin/ledger":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            try:
+                options = parse_ledger_query(parse_qs(parsed.query))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
+            conn = get_db(pool.db_path)
+            pool.refresh(conn)
+            payload = pool.ledger.page(conn, **options)
+            release_db(conn)
             send_json(self, payload)
             return
 
-        return super().do_GET()
+        if path == "/api/admin/pools" and pool.id == DEFAULT_POOL_ID:
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            send_json(self, {"pools": POOLS.list()})
+            return
+
+        if path.startswith("/api/admin/export/"):
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            kind = path[len("/api/admin/export/"):]
+            fmt = parse_qs(parsed.query).get("format", ["csv"])[0]
+            if kind not in EXPORTERS:
+                send_json(self, {"error": "Not found"}, 404)
+                return
+            if fmt not in {"csv", "ndjson"}:
+                send_json(self, {"error": "Export format must be csv or ndjson."}, 400)
+                return
+            conn = get_db(pool.db_path)
+            try:
+                # One read transaction, so the whole download is a single consistent snapshot.
+                conn.execute("BEGIN")
+                columns, rows = EXPORTERS[kind](pool, conn)
+                content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+                send_chunked(self, encode_export(columns, rows, fmt), content_type, filename=f"{pool.id}-{kind}.{fmt}")
+            finally:
+                release_db(conn)
+            return
+
+        self.send_static(parsed)
+
+    def do_HEAD(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/api/"):
+            self.send_error(405)
+            return
+        self.send_static(parsed, head=True)
+
+    def send_static(self, parsed, head=False):
+        if not STATIC_ASSETS:
+            load_static_assets()
+        path = "/index.html" if parsed.path == "/" else parsed.path
+        asset = None
+        version = parse_qs(parsed.query).get("v")
+        if version:
+            asset = STATIC_ASSETS.get((path, version[0]))
+        asset = asset or STATIC_ASSETS.get(path)
+        if asset is None:
+            # Files added after startup are still served straight from disk.
+            if head:
+                return super().do_HEAD()
+            return super().do_GET()
+        send_body(
+            self,
+            asset.body,
+            content_type=asset.content_type,
+            etag=asset.etag,
+            cache_control=asset.cache_control,
+            variants=asset.variants,
+            head=head,
+        )
+
+    def open_event_stream(self, pool):
+        if not BROKER.has_room():
+            send_json(self, {"error": "Too many live viewers. Please refresh later."}, 503)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        if BROKER.subscribe(self.connection, pool.id):
+            self.server.detach(self.request)
 
     def do_POST(self):
         parsed = urlparse(self.path)
+        pool, path = self.resolve_pool(parsed.path)
+        if pool is None:
+            send_json(self, {"error": "Unknown pool."}, 404)
+            return
+        if self.oversized(path) or self.throttled(pool, path):
+            return
 
-        if parsed.path == "/api/admin/login":
+        if path == "/api/admin/login":
             data = parse_json(self)
-            ok = data.get("password") == ADMIN_PASSWORD
+            ok = data.get("password") == pool.admin_password
             send_json(self, {"ok": ok}, 200 if ok else 401)
             return
 
-        if parsed.path == "/api/admin/correct-answers":
-            if self.headers.get("X-Admin-Password", "") != ADMIN_PASSWORD:
+        if path == "/api/admin/correct-answers":
+            if not self.is_admin(pool):
                 send_json(self, {"error": "Unauthorized"}, 401)
                 return
             data = parse_json(self)
             answers = data.get("answers", {})
-            conn = get_db()
-            for q in QUESTIONS:
-                raw = answers.get(str(q["id"]))
-                if raw is None or str(raw).strip() == "":
-                    conn.execute("DELETE FROM correct_answers WHERE question_id = ?", (q["id"],))
-                    continue
+            catalog = pool.catalog
+            conn = get_db(pool.db_path)
+            saved = {r["question_id"]: r["answer_text"] for r in conn.execute("SELECT question_id, answer_text FROM correct_answers")}
+            changes = []
+            for key, q in catalog.by_key.items():
                 try:
-                    normalized = validate_answer(q, raw)
+                    normalized = catalog.validate(q, answers.get(key))
                 except ValueError as err:
-                    conn.close()
+                    release_db(conn)
                     send_json(self, {"error": str(err)}, 400)
                     return
+                if normalized != saved.get(q["id"]):
+                    changes.append((q["id"], normalized))
+            # Only the questions whose answer moved are written, so the
+            # leaderboard redoes just those.
+            for qid, normalized in changes:
+                if normalized is None:
+                    conn.execute("DELETE FROM correct_answers WHERE question_id = ?", (qid,))
+                    continue
                 conn.execute(
                     """
                     INSERT INTO correct_answers(question_id, answer_text)
                     VALUES(?, ?)
                     ON CONFLICT(question_id) DO UPDATE SET answer_text = excluded.answer_text
                     """,
-                    (q["id"], normalized),
+                    (qid, normalized),
                 )
-            conn.commit()
-            payload = build_admin_payload(conn)
-            conn.close()
+            if changes:
+                conn.commit()
+                pool.refresh(conn, local=True)
+            payload = pool.ledger.summary(conn)
+            release_db(conn)
+            if changes:
+                BROKER.publish(pool.id, "correct-answers", {"correctAnswers": payload["correctAnswers"]})
             send_json(self, payload)
             return
 
-        if parsed.path == "/api/admin/squares-scores":
-            if self.headers.get("X-Admin-Password", "") != ADMIN_PASSWORD:
+        if path == "/api/admin/squares-scores":
+            if not self.is_admin(pool):
                 send_json(self, {"error": "Unauthorized"}, 401)
                 return
             data = parse_json(self)
-            scores = data.get("scores", {})
+            try:
+                scores = parse_quarter_scores(data.get("scores", {}))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
             values = {}
-            for quarter in ["q1", "q2", "q3", "q4"]:
-                q_scores = scores.get(quarter, {})
-                for team in ["patriots", "seahawks"]:
-                    key = f"{quarter}_{team[:3]}" if team == "patriots" else f"{quarter}_sea"
-                    raw = q_scores.get(team)
-                    if raw is None or raw == "":
-                        values[key] = None
-                        continue
-                    if not isinstance(raw, int) or raw < 0 or raw > 200:
-                        send_json(self, {"error": f"Invalid score for {quarter} {team}."}, 400)
-                        return
-                    values[key] = raw
+            for quarter, q_scores in scores.items():
+                values[f"{quarter}_pat"] = q_scores["patriots"]
+                values[f"{quarter}_sea"] = q_scores["seahawks"]
 
-            conn = get_db()
+            conn = get_db(pool.db_path)
             conn.execute(
                 """
                 UPDATE square_game SET
@@ -672,107 +3591,172 @@ class Handler(SimpleHTTPRequestHandler):
                 ),
             )
             conn.commit()
-            payload = build_admin_payload(conn)
-            conn.close()
+            pool.refresh(conn, local=True)
+            payload = pool.ledger.summary(conn)
+            release_db(conn)
+            BROKER.publish(pool.id, "scores", {"scores": payload["squares"]["scores"], "quarters": payload["squares"]["quarters"]})
             send_json(self, payload)
             return
 
-        if parsed.path == "/api/view-guesses":
+        if path == "/api/squares/hold":
             data = parse_json(self)
-            last4 = digits_only(data.get("last4", ""))
-            if len(last4) != 4:
-                send_json(self, {"error": "Please provide exactly 4 digits."}, 400)
+            try:
+                squares = parse_square_selections(data.get("squares", []))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
                 return
-            conn = get_db()
-            payload = build_submission_view(conn, last4)
-            conn.close()
-            if payload is None:
-                send_json(self, {"error": "No submission found for that phone ending."}, 404)
+            token = str(data.get("token") or "") or secrets.token_urlsafe(12)
+            conn = get_db(pool.db_path)
+            pool.occupancy.sync(conn)
+            release_db(conn)
+            conflicts = pool.occupancy.hold(token, squares)
+            if conflicts:
+                send_json(self, {"error": "Some of those squares are no longer available.", "conflicts": conflicts}, 409)
                 return
-            send_json(self, {"ok": True, "submission": payload})
+            BROKER.publish(pool.id, "holds", {"held": pool.occupancy.held()})
+            send_json(self, {"ok": True, "token": token, "squares": squares, "expiresIn": SQUARE_HOLD_SECONDS})
             return
 
-        if parsed.path == "/api/submissions":
+        if path == "/api/squares/release":
             data = parse_json(self)
-            full_name = str(data.get("fullName", "")).strip()
-            venmo_handle = str(data.get("venmoHandle", "")).strip()
-            phone_number = str(data.get("phoneNumber", "")).strip()
-            payment_method = str(data.get("paymentMethod", "")).strip().lower()
-            answers = data.get("answers", {})
+            token = str(data.get("token") or "")
+            if token:
+                pool.occupancy.release(token)
+                BROKER.publish(pool.id, "holds", {"held": pool.occupancy.held()})
+            send_json(self, {"ok": True})
+            return
 
-            if not full_name:
-                send_json(self, {"error": "Full name is required."}, 400)
+        if path == "/api/admin/import":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
                 return
-            if payment_method not in {"cash", "venmo"}:
-                send_json(self, {"error": "Invalid payment method."}, 400)
+            params = parse_qs(parsed.query)
+            content_type = self.headers.get("Content-Type", "")
+            fmt = params.get("format", ["ndjson" if "json" in content_type else "csv"])[0]
+            if fmt not in {"csv", "ndjson"}:
+                send_json(self, {"error": "Import format must be csv or ndjson."}, 400)
                 return
-            if not isinstance(answers, dict):
-                send_json(self, {"error": "Answers payload is invalid."}, 400)
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+            except ValueError:
+                length = 0
+            raw = self.rfile.read(length).decode("utf-8-sig") if length else ""
+            conn = get_db(pool.db_path)
+            result = import_submissions(
+                conn,
+                parse_import_records(raw, fmt),
+                pool.catalog,
+                partial=params.get("partial", ["0"])[0] == "1",
+                dry_run=params.get("dryRun", ["0"])[0] == "1",
+            )
+            release_db(conn)
+            if result["imported"]:
+                pool.refresh(local=True)
+                BROKER.publish(pool.id, "import", {"imported": result["imported"]})
+            if result["rejected"] and not result["imported"] and not result["dryRun"]:
+                result["error"] = f"{len(result['rejected'])} row(s) rejected; nothing was imported."
+                send_json(self, result, 400)
                 return
+            send_json(self, dict(result, ok=True))
+            return
 
+        if path == "/api/admin/what-if":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            data = parse_json(self)
+            conn = get_db(pool.db_path)
             try:
-                squares = parse_square_selections(data.get("squareSelections", []))
+                payload = build_what_if(pool, conn, data.get("answers"))
             except ValueError as err:
                 send_json(self, {"error": str(err)}, 400)
                 return
+            finally:
+                release_db(conn)
+            send_json(self, payload)
+            return
 
-            normalized_answers = []
-            total_owed = 0
-            for q in QUESTIONS:
-                raw = answers.get(str(q["id"]))
-                try:
-                    normalized = validate_answer(q, raw)
-                except ValueError as err:
-                    send_json(self, {"error": str(err)}, 400)
-                    return
-                if normalized is None:
-                    continue
-                normalized_answers.append((q["id"], normalized))
-                total_owed += q["cost"]
-
-            total_owed += len(squares) * SQUARES_COST
+        if path == "/api/admin/simulate":
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            data = parse_json(self)
+            conn = get_db(pool.db_path)
+            try:
+                payload = simulate_payouts(pool, conn, data.get("scenarios"), data.get("people"))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
+            finally:
+                release_db(conn)
+            send_json(self, payload)
+            return
 
-            conn = get_db()
-            now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        if path == "/api/admin/pools" and pool.id == DEFAULT_POOL_ID:
+            if not self.is_admin(pool):
+                send_json(self, {"error": "Unauthorized"}, 401)
+                return
+            data = parse_json(self)
             try:
-                conn.execute("BEGIN IMMEDIATE")
-
-                for sq in squares:
-                    taken = conn.execute(
-                        "SELECT 1 FROM square_selections WHERE row_idx = ? AND col_idx = ?",
-                        (sq["row"], sq["col"]),
-                    ).fetchone()
-                    if taken:
-                        conn.execute("ROLLBACK")
-                        send_json(self, {"error": f"Square {sq['row'] + 1},{sq['col'] + 1} was just taken. Please pick another."}, 409)
-                        conn.close()
-                        return
+                created = POOLS.create(data.get("id"), data.get("name"), data.get("adminPassword"), data.get("questions"))
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
+            send_json(self, {"ok": True, "pool": {"id": created.id, "name": created.name}}, 201)
+            return
 
-                cur = conn.execute(
-                    """
-                    INSERT INTO submissions(full_name, venmo_handle, phone_number, payment_method, total_owed, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (full_name, venmo_handle, phone_number, payment_method, total_owed, now),
-                )
-                submission_id = cur.lastrowid
+        if path == "/api/view-guesses":
+            data = parse_json(self)
+            last4 = digits_only(data.get("last4", ""))
+            if len(last4) != 4:
+                send_json(self, {"error": "Please provide exactly 4 digits."}, 400)
+                return
+            conn = get_db(pool.db_path)
+            payload = build_submission_view(conn, last4)
+            release_db(conn)
+            if payload is None:
+                send_json(self, {"error": "No submission found for that phone ending."}, 404)
+                return
+            send_json(self, {"ok": True, "submission": payload})
+            return
 
-                conn.executemany(
-                    "INSERT INTO answers(submission_id, question_id, answer_text) VALUES (?, ?, ?)",
-                    [(submission_id, qid, ans) for qid, ans in normalized_answers],
-                )
+        if path == "/api/submissions":
+            data = parse_json(self)
+            try:
+                entry = normalize_submission(data, pool.catalog)
+            except ValueError as err:
+                send_json(self, {"error": str(err)}, 400)
+                return
+            squares = entry["squares"]
+            normalized_answers = entry["answers"]
+            full_name = entry["fullName"]
+            total_owed = entry["totalOwed"]
 
-                conn.executemany(
-                    "INSERT INTO square_selections(submission_id, row_idx, col_idx) VALUES (?, ?, ?)",
-                    [(submission_id, sq["row"], sq["col"]) for sq in squares],
-                )
+            conn = get_db(pool.db_path)
+            pool.occupancy.sync(conn)
+            release_db(conn)
+            claim, conflicts = pool.occupancy.claim(squares, data.get("holdToken") or None)
+            if conflicts:
+                taken = conflicts[0]
+                send_json(self, {"error": f"Square {taken['row'] + 1},{taken['col'] + 1} was just taken. Please pick another."}, 409)
+                return
 
-                conn.commit()
+            now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+            try:
+                submission_id = pool.writer.submit(entry, now)
             except sqlite3.IntegrityError:
-                conn.rollback()
-                conn.close()
+                pool.occupancy.release(claim)
+                conn = get_db(pool.db_path)
+                pool.occupancy.sync(conn)
+                release_db(conn)
                 send_json(self, {"error": "One or more selected squares were unavailable."}, 409)
                 return
+            except sqlite3.OperationalError:
+                pool.occupancy.release(claim)
+                send_json(self, {"error": "The board is busy. Please try again."}, 503, headers={"Retry-After": "1"})
+                return
+            pool.refresh(local=True)
+            pool.occupancy.sold(squares, pool.tallies.identity(full_name), claim)
 
             payload = {
                 "ok": True,
@@ -781,19 +3765,382 @@ class Handler(SimpleHTTPRequestHandler):
                 "squareCount": len(squares),
                 "totalOwed": total_owed,
             }
-            conn.close()
+            BROKER.publish(
+                pool.id,
+                "submission",
+                {
+                    "submissionId": submission_id,
+                    "participantId": pool.tallies.participant_id(full_name),
+                    "person": pool.tallies.identity(full_name),
+                    "answers": {str(qid): ans for qid, ans in normalized_answers},
+                    "squares": squares,
+                },
+            )
             send_json(self, payload)
             return
 
         send_json(self, {"error": "Not found"}, 404)
 
 
-def run_server(host="0.0.0.0", port=8000):
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands accepted connections to a fixed pool of worker threads.
+
+    Connections wait in a bounded queue; once it is full new connections get an
+    immediate 503 instead of piling up. Idle keep-alive connections are only held
+    open while no other connection is waiting for a worker.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, reuse_port=False):
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.detached = set()
+        self.workers = []
+        for i in range(workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"http-worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def server_bind(self):
+        if self.reuse_port:
+            # Prefork mode: every worker process listens on the port and the kernel spreads connections.
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        try:
+            self.pending.put_nowait((request, client_address))
+        except queue.Full:
+            self.reject_request(request)
+
+    def reject_request(self, request):
+        body = b'{"error": "Server is busy. Please retry."}'
+        head = (
+            "HTTP/1.1 503 Service Unavailable\r\n"
+            "Content-Type: application/json\r\n"
+            "Retry-After: 1\r\n"
+            "Connection: close\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        try:
+            request.sendall(head.encode("ascii") + body)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def wait_for_next_request(self, sock, timeout=KEEPALIVE_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while self.pending.empty():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                readable, _, _ = select.select([sock], [], [], min(remaining, 0.1))
+            except (OSError, ValueError):
+                return False
+            if readable:
+                return True
+        return False
+
+    def detach(self, request):
+        """Hand a connection over to someone else; shutdown_request will leave it open."""
+        self.detached.add(request)
+
+    def shutdown_request(self, request):
+        if request in self.detached:
+            self.detached.discard(request)
+            return
+        super().shutdown_request(request)
+
+    def _worker_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self.workers:
+            self.pending.put(None)
+
+
+def run_server(
+    host="0.0.0.0",
+    port=8000,
+    workers=DEFAULT_WORKERS,
+    queue_size=DEFAULT_QUEUE_SIZE,
+    max_subscribers=STREAM_MAX_SUBSCRIBERS,
+    backup_interval=BACKUP_INTERVAL,
+    backup_dir=None,
+    processes=1,
+):
+    started = time.perf_counter()
+    BROKER.max_subscribers = max_subscribers
+    init_db()
+    POOLS.init()
+    load_static_assets()
+    pool = POOLS.default()
+    restored = pool.warm()
+    conn = get_db(pool.db_path)
+    pool.cache.get("results", lambda: build_results(pool, conn))
+    release_db(conn)
+    print(
+        f"Loaded {pool.tallies.total_submissions} entries from {'the snapshot' if restored else 'a full scan'} "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    if processes > 1:
+        run_prefork(host, port, processes, workers, queue_size, backup_interval, backup_dir)
+        return
+    server = PooledHTTPServer((host, port), Handler, workers=workers, queue_size=queue_size)
+    print(f"Serving on http://{host}:{port} with {workers} worker(s)")
+    serve(server, backup_interval, backup_dir)
+
+
+def serve(server, backup_interval=BACKUP_INTERVAL, backup_dir=None, snapshots=True):
+    """Run server until SIGTERM or Ctrl-C, with the background threads beside it.
+
+    With snapshots, each loaded pool's warm-start snapshot is written on the
+    way out (and after every backup).
+    """
+    threads = [QuestionWatcher(), ChangeMonitor()]
+    if backup_interval > 0:
+        threads.append(BackupScheduler(backup_interval, backup_dir))
+    for thread in threads:
+        thread.start()
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for thread in threads:
+            thread.stop()
+        if snapshots:
+            for loaded in POOLS.loaded():
+                try:
+                    loaded.save_snapshot()
+                except (OSError, sqlite3.Error) as err:
+                    print(f"Could not save the snapshot for {loaded.id}: {err}", file=sys.stderr)
+
+
+def run_prefork(host, port, processes, workers, queue_size, backup_interval=BACKUP_INTERVAL, backup_dir=None):
+    """Serve from `processes` forked copies of this server listening on one port with SO_REUSEPORT.
+
+    Each child has its own GIL, worker threads and caches, forked from the
+    warm ones built at startup. Pool.refresh() keeps them coherent through
+    the shared data_changes counter. The parent only supervises: a child that
+    exits is started again (after a pause if it died young), and SIGTERM or
+    Ctrl-C stops them all. Child 0 also takes the backups and writes the
+    snapshots, so only one process does that work.
+    """
+    if not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"):
+        raise SystemExit("--processes needs fork() and SO_REUSEPORT (Linux, macOS or BSD).")
+    # Holding the port in the reuse group means a busy port is reported once,
+    # here, and a restarting child can always bind it again.
+    holder = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    holder.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    try:
+        holder.bind((host, port))
+    except OSError as err:
+        raise SystemExit(f"Cannot listen on {host}:{port}: {err}")
+    # SQLite connections must not be shared with the children.
+    close_thread_dbs()
+    children = {}
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                holder.close()
+                server = PooledHTTPServer((host, port), Handler, workers=workers, queue_size=queue_size, reuse_port=True)
+                first = index == 0
+                serve(server, backup_interval if first else 0, backup_dir, snapshots=first)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = (index, time.monotonic())
+
+    for index in range(processes):
+        spawn(index)
+    print(f"Serving on http://{host}:{port} with {processes} processes of {workers} worker(s)")
+    sys.stdout.flush()
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while True:
+            pid, status = os.wait()
+            if pid not in children:
+                continue
+            index, started = children.pop(pid)
+            print(f"Worker process {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting", file=sys.stderr)
+            if time.monotonic() - started < PREFORK_RESTART_DELAY:
+                time.sleep(PREFORK_RESTART_DELAY)
+            spawn(index)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        holder.close()
+
+
+def run_import(args):
+    fmt = args.format or ("ndjson" if args.file.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.file, encoding="utf-8-sig") as fh:
+        raw = fh.read()
+    init_db()
+    POOLS.init()
+    pool = POOLS.get(args.pool)
+    if pool is None:
+        print(f"No pool called {args.pool}.")
+        return 1
+    conn = connect_db(pool.db_path)
+    result = import_submissions(conn, parse_import_records(raw, fmt), pool.catalog, partial=args.partial, dry_run=args.dry_run)
+    conn.close()
+    for item in result["rejected"]:
+        print(f"line {item['row']}: {item['error']}")
+    if result["dryRun"]:
+        print(f"{result['valid']} row(s) valid, {len(result['rejected'])} rejected (dry run, nothing written).")
+    else:
+        print(f"Imported {result['imported']} row(s), rejected {len(result['rejected'])}.")
+    return 1 if result["rejected"] and not result["imported"] else 0
+
+
+def run_backup(args):
     init_db()
-    server = HTTPServer((host, port), Handler)
-    print(f"Serving on http://{host}:{port}")
-    server.serve_forever()
+    POOLS.init()
+    print(f"Backed up to {take_backup(args.backup_dir)}")
+    return 0
+
+
+def run_restore(args):
+    root = args.backup_dir or backup_root()
+    if not args.source:
+        names = list_backups(root)
+        if not names:
+            print(f"No backups in {root}.")
+            return 1
+        for name in names:
+            print(os.path.join(root, name))
+        return 0
+    source = args.source if os.path.exists(args.source) else os.path.join(root, args.source)
+    try:
+        written = restore_backup(source, args.pool)
+    except ValueError as err:
+        print(err)
+        return 1
+    for path in written:
+        print(f"Restored {path}")
+    return 0
+
+
+def run_create_pool(args):
+    questions = None
+    if args.questions:
+        with open(args.questions, encoding="utf-8") as fh:
+            questions = json.load(fh)
+    init_db()
+    POOLS.init()
+    try:
+        pool = POOLS.create(args.id, args.name, args.password, questions)
+    except ValueError as err:
+        print(err)
+        return 1
+    print(f"Created pool {pool.id} at /api/pools/{pool.id}/ (open /?pool={pool.id}).")
+    return 0
+
+
+def main(argv=None):
+    global DB_PATH
+
+    parser = argparse.ArgumentParser(description="Super Bowl betting board server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of request worker threads.")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes sharing the port (prefork mode when above 1).")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Connections allowed to wait for a worker before returning 503.")
+    parser.add_argument("--max-subscribers", type=int, default=STREAM_MAX_SUBSCRIBERS, help="Live /api/stream connections allowed at once.")
+    parser.add_argument("--log-format", choices=["access", "json"], default="access", help="Stderr access log style.")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Turn off per-client rate limits (for load testing).")
+    parser.add_argument("--no-group-commit", action="store_true", help="Commit each submission in its own transaction.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database file.")
+    parser.add_argument("--backup-interval", type=int, default=BACKUP_INTERVAL, help="Seconds between online backups; 0 turns them off.")
+    parser.add_argument("--backup-dir", help="Where backups go; defaults to backups/ next to the database.")
+    sub = parser.add_subparsers(dest="command")
+
+    importer = sub.add_parser("import", help="Bulk-import submissions from a CSV or NDJSON file.")
+    importer.add_argument("file")
+    importer.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension.")
+    importer.add_argument("--partial", action="store_true", help="Import the valid rows even if some are rejected.")
+    importer.add_argument("--dry-run", action="store_true", help="Validate only; write nothing.")
+    importer.add_argument("--pool", default=DEFAULT_POOL_ID, help="Pool to import into.")
+
+    sub.add_parser("backup", help="Take an online backup of every database now.")
+
+    restorer = sub.add_parser("restore", help="Restore a backup (stop the server first); lists backups when none is named.")
+    restorer.add_argument("source", nargs="?", help="Backup directory, its name under the backup dir, or a single .db file.")
+    restorer.add_argument("--pool", help="Restore only this pool.")
+
+    creator = sub.add_parser("create-pool", help="Register a new pool with its own board, questions and admin password.")
+    creator.add_argument("id", help="Lowercase letters, digits and dashes; used in /api/pools/<id>/.")
+    creator.add_argument("--name", default="")
+    creator.add_argument("--password", required=True, help="Admin password for the new pool.")
+    creator.add_argument("--questions", help="JSON file with the question list; defaults to questions.json.")
+    args = parser.parse_args(argv)
+
+    DB_PATH = os.path.abspath(args.db)
+    Handler.log_format = args.log_format
+    LIMITER.enabled = not args.no_rate_limit
+    SubmissionWriter.group_commit = not args.no_group_commit
+    if args.command == "import":
+        raise SystemExit(run_import(args))
+    if args.command == "create-pool":
+        raise SystemExit(run_create_pool(args))
+    if args.command == "backup":
+        raise SystemExit(run_backup(args))
+    if args.command == "restore":
+        raise SystemExit(run_restore(args))
+    run_server(
+        args.host,
+        args.port,
+        workers=max(1, args.workers),
+        queue_size=max(1, args.queue_size),
+        max_subscribers=max(0, args.max_subscribers),
+        backup_interval=max(0, args.backup_interval),
+        backup_dir=args.backup_dir,
+        processes=max(1, args.processes),
+    )
 
 
 if __name__ == "__main__":
-    run_server()
+    main()
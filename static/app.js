@@ -1,12 +1,22 @@
-const STORAGE_KEY = "sb_betting_draft_v2";
+const POOL_ID = new URLSearchParams(window.location.search).get("pool") || "";
+const API_BASE = POOL_ID ? `/api/pools/${encodeURIComponent(POOL_ID)}` : "/api";
+const ADMIN_LEDGER_PAGE_SIZE = 50;
+const RESULTS_PAGE_SIZE = 100;
+const STORAGE_KEY = POOL_ID ? `sb_betting_draft_v2:${POOL_ID}` : "sb_betting_draft_v2";
 
 const state = {
   questions: [],
   answers: {},
   squareSelections: [],
+  holdToken: "",
   squaresPublic: null,
   squaresRevealed: null,
+  results: null,
+  resultDetails: {},
+  leaderboard: null,
+  stream: null,
   adminPassword: "",
+  adminLedger: { sort: "net", order: "desc", q: "", offset: 0 },
   previousView: "survey",
   mySubmission: null,
 };
@@ -30,10 +40,18 @@ const el = {
   resultsContainer: document.getElementById("resultsContainer"),
   resultsSquares: document.getElementById("resultsSquares"),
   myGuessesCard: document.getElementById("myGuessesCard"),
+  leaderboardCard: document.getElementById("leaderboardCard"),
   adminAnswersContainer: document.getElementById("adminAnswersContainer"),
   adminTotals: document.getElementById("adminTotals"),
   adminByPerson: document.getElementById("adminByPerson"),
+  adminLedgerSearch: document.getElementById("adminLedgerSearch"),
+  adminLedgerSort: document.getElementById("adminLedgerSort"),
+  adminLedgerOrder: document.getElementById("adminLedgerOrder"),
+  adminLedgerPrev: document.getElementById("adminLedgerPrev"),
+  adminLedgerNext: document.getElementById("adminLedgerNext"),
+  adminLedgerPage: document.getElementById("adminLedgerPage"),
   adminByQuestion: document.getElementById("adminByQuestion"),
+  adminWhatIf: document.getElementById("adminWhatIf"),
   adminSquaresPot: document.getElementById("adminSquaresPot"),
   adminSquaresScoreInputs: document.getElementById("adminSquaresScoreInputs"),
   adminSquaresGrid: document.getElementById("adminSquaresGrid"),
@@ -80,6 +98,7 @@ function saveDraft() {
     phoneNumber: el.phoneNumber.value.trim(),
     answers: state.answers,
     squareSelections: state.squareSelections,
+    holdToken: state.holdToken,
   };
   localStorage.setItem(STORAGE_KEY, JSON.stringify(payload));
 }
@@ -91,6 +110,7 @@ function restoreDraft() {
     const payload = JSON.parse(raw);
     state.answers = payload.answers && typeof payload.answers === "object" ? payload.answers : {};
     state.squareSelections = Array.isArray(payload.squareSelections) ? payload.squareSelections : [];
+    state.holdToken = payload.holdToken || "";
     el.fullName.value = payload.fullName || "";
     el.venmoHandle.value = payload.venmoHandle || "";
     el.phoneNumber.value = payload.phoneNumber || "";
@@ -300,8 +320,12 @@ function makeSquareTable({ hiddenNumbers, rowDigits, colDigits, takenByCell, onC
 function renderSurveySquares() {
   if (!state.squaresPublic) return;
 
-  const takenMap = new Map((state.squaresPublic.taken || []).map((s) => [keyForSquare(s), { initials: "", name: "Taken" }]));
   const mineSet = new Set(state.squareSelections.map(keyForSquare));
+  const takenMap = new Map((state.squaresPublic.taken || []).map((s) => [keyForSquare(s), { initials: "", name: "Taken" }]));
+  (state.squaresPublic.held || []).forEach((s) => {
+    const key = keyForSquare(s);
+    if (!mineSet.has(key) && !takenMap.has(key)) takenMap.set(key, { initials: "", name: "Being picked by someone else" });
+  });
 
   const table = makeSquareTable({
     hiddenNumbers: true,
@@ -310,19 +334,26 @@ function renderSurveySquares() {
     takenByCell: takenMap,
     mineSet,
     showPeople: false,
-    onCellClick: (row, col) => {
+    onCellClick: async (row, col) => {
       const key = `${row}-${col}`;
       if (takenMap.has(key) && !mineSet.has(key)) return;
 
+      let next;
       if (mineSet.has(key)) {
-        state.squareSelections = state.squareSelections.filter((sq) => !(sq.row === row && sq.col === col));
+        next = state.squareSelections.filter((sq) => !(sq.row === row && sq.col === col));
       } else {
         const max = state.squaresPublic.maxPerUser || 5;
         if (state.squareSelections.length >= max) {
           alert(`You can select up to ${max} squares.`);
           return;
         }
-        state.squareSelections.push({ row, col });
+        next = [...state.squareSelections, { row, col }];
+      }
+      if (!(await holdSquares(next))) {
+        alert("Someone else just grabbed that square. Please pick another.");
+        await loadSquaresPublic();
+      } else {
+        state.squareSelections = next;
       }
       renderSurveySquares();
       renderSquaresSummary();
@@ -398,10 +429,10 @@ async function submitSurvey(paymentMethod) {
     return false;
   }
 
-  const res = await fetch("/api/submissions", {
+  const res = await fetch(`${API_BASE}/submissions`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ ...payload, paymentMethod }),
+    body: JSON.stringify({ ...payload, paymentMethod, holdToken: state.holdToken }),
   });
 
   const data = await res.json();
@@ -426,18 +457,25 @@ async function submitSurvey(paymentMethod) {
 
   clearDraft();
   state.squareSelections = [];
+  state.holdToken = "";
   await loadResults();
   showView("results");
   return true;
 }
 
 function renderNumeric(question, wrapper) {
-  const max = Math.max(5, question.scaleMax || 5);
+  const detail = state.resultDetails[question.id];
+  if (detail && detail.points) renderPins(detail, wrapper);
+  else renderHistogram(question, wrapper);
+}
+
+function renderPins(detail, wrapper) {
+  const max = Math.max(5, detail.scaleMax || 5);
   const scale = document.createElement("div");
   scale.className = "scale";
   scale.innerHTML = `<div class="scale-line"></div>`;
 
-  question.points.forEach((point, index) => {
+  detail.points.forEach((point, index) => {
     const pin = document.createElement("div");
     pin.className = "pin";
     pin.style.left = `${(point.value / max) * 100}%`;
@@ -456,6 +494,26 @@ function renderNumeric(question, wrapper) {
   wrapper.appendChild(scale);
 }
 
+function renderHistogram(question, wrapper) {
+  const maxCount = Math.max(1, ...question.bins.map((b) => b.count));
+  const chart = document.createElement("div");
+  chart.className = "histogram";
+
+  question.bins.forEach((bin) => {
+    const column = document.createElement("div");
+    column.className = "histogram-bar";
+    column.style.height = `${(bin.count / maxCount) * 100}%`;
+    column.title = `${bin.from}-${bin.to}: ${bin.count} guess(es)`;
+    chart.appendChild(column);
+  });
+
+  const labels = document.createElement("div");
+  labels.className = "scale-labels";
+  labels.innerHTML = `<span>${question.bins[0]?.from ?? 0}</span><span>${question.scaleMax}</span>`;
+
+  wrapper.append(chart, labels);
+}
+
 function renderMultipleChoice(question, wrapper) {
   const barsWrap = document.createElement("div");
   barsWrap.className = "bars";
@@ -474,19 +532,6 @@ function renderMultipleChoice(question, wrapper) {
     const fill = document.createElement("div");
     fill.className = "bar-fill";
     fill.style.width = `${(bar.count / maxCount) * 100}%`;
-
-    const avatars = document.createElement("div");
-    avatars.className = "avatar-group";
-    bar.participants.slice(0, 14).forEach((p) => {
-      const a = document.createElement("div");
-      a.className = "avatar";
-      a.title = p.name;
-      a.style.background = p.color;
-      a.textContent = p.initials;
-      avatars.appendChild(a);
-    });
-
-    fill.appendChild(avatars);
     track.appendChild(fill);
 
     const count = document.createElement("div");
@@ -499,22 +544,140 @@ function renderMultipleChoice(question, wrapper) {
   wrapper.appendChild(barsWrap);
 }
 
+// Entries behind one question, fetched when it is expanded and a page at a time after that.
+async function loadQuestionDetail(questionId, more = false) {
+  const current = state.resultDetails[questionId];
+  const params = new URLSearchParams({ limit: String(RESULTS_PAGE_SIZE) });
+  if (more && current && current.nextCursor) params.set("cursor", current.nextCursor);
+  const res = await fetch(`${API_BASE}/results/${questionId}?${params}`);
+  if (!res.ok) return;
+  const detail = await res.json();
+  if (more && current) detail.participants = current.participants.concat(detail.participants);
+  state.resultDetails[questionId] = detail;
+  renderResults();
+}
+
+function renderQuestionEntries(question, wrapper) {
+  const detail = state.resultDetails[question.id];
+  const toggle = document.createElement("button");
+  toggle.className = "ghost-btn";
+  toggle.textContent = detail ? "Hide entries" : `Show entries (${question.count})`;
+  toggle.addEventListener("click", () => {
+    if (!detail) {
+      loadQuestionDetail(question.id);
+      return;
+    }
+    delete state.resultDetails[question.id];
+    renderResults();
+  });
+
+  const actions = document.createElement("div");
+  actions.className = "pay-buttons";
+  actions.appendChild(toggle);
+  wrapper.appendChild(actions);
+  if (!detail) return;
+
+  const rows = detail.participants
+    .map(
+      (p) => `<tr><td><span class="avatar" style="display:inline-flex;background:${p.color};vertical-align:middle;margin-right:8px;">${p.initials}</span>${p.name}</td><td>${p.answer}</td></tr>`
+    )
+    .join("");
+  const table = document.createElement("div");
+  table.innerHTML = `
+    <table class="admin-table"><thead><tr><th>Name</th><th>Answer</th></tr></thead>
+    <tbody>${rows || `<tr><td colspan="2">No entries yet.</td></tr>`}</tbody></table>
+  `;
+  wrapper.appendChild(table);
+
+  if (detail.nextCursor) {
+    const more = document.createElement("button");
+    more.className = "ghost-btn";
+    more.textContent = "Show more";
+    more.addEventListener("click", () => loadQuestionDetail(question.id, true));
+    const moreActions = document.createElement("div");
+    moreActions.className = "pay-buttons";
+    moreActions.appendChild(more);
+    wrapper.appendChild(moreActions);
+  }
+}
+
 async function loadSquaresPublic() {
-  const res = await fetch("/api/squares/public");
+  const query = state.holdToken ? `?token=${encodeURIComponent(state.holdToken)}` : "";
+  const res = await fetch(`${API_BASE}/squares/public${query}`);
   state.squaresPublic = await res.json();
 
-  const takenKeys = new Set((state.squaresPublic.taken || []).map(keyForSquare));
+  const unavailable = [...(state.squaresPublic.taken || []), ...(state.squaresPublic.held || [])];
+  const takenKeys = new Set(unavailable.map(keyForSquare));
   state.squareSelections = state.squareSelections.filter((sq) => !takenKeys.has(keyForSquare(sq)));
 }
 
+async function holdSquares(squares) {
+  if (!squares.length && !state.holdToken) return true;
+  const res = await fetch(`${API_BASE}/squares/hold`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ token: state.holdToken, squares }),
+  });
+  if (!res.ok) return false;
+  state.holdToken = (await res.json()).token;
+  return true;
+}
+
+function keepHoldsAlive() {
+  const seconds = state.squaresPublic?.holdSeconds || 120;
+  setInterval(() => {
+    if (state.squareSelections.length && activeViewName() !== "results") holdSquares(state.squareSelections);
+  }, (seconds * 1000) / 2);
+}
+
 async function loadResults() {
-  const [resultsRes, squaresRes] = await Promise.all([fetch("/api/results"), fetch("/api/squares/revealed")]);
-  const data = await resultsRes.json();
+  const [resultsRes, squaresRes, leaderboardRes] = await Promise.all([
+    fetch(`${API_BASE}/results/summary`),
+    fetch(`${API_BASE}/squares/revealed`),
+    fetch(`${API_BASE}/leaderboard`),
+  ]);
+  state.results = await resultsRes.json();
   state.squaresRevealed = await squaresRes.json();
+  state.leaderboard = await leaderboardRes.json();
+  renderResults();
+}
+
+async function loadLeaderboard() {
+  if (activeViewName() !== "results") return;
+  const res = await fetch(`${API_BASE}/leaderboard`);
+  state.leaderboard = await res.json();
+  renderLeaderboard();
+}
+
+function renderLeaderboard() {
+  const board = state.leaderboard;
+  if (!board || !board.leaders.length) {
+    el.leaderboardCard.innerHTML = "";
+    return;
+  }
+  const rows = board.leaders
+    .map(
+      (p) => `<tr><td>${p.rank}</td><td><span class="avatar" style="display:inline-flex;background:${p.color};vertical-align:middle;margin-right:8px;">${p.initials}</span>${p.name}</td><td>${p.correct}</td><td>${formatDollars(p.winnings)}</td></tr>`
+    )
+    .join("");
+  el.leaderboardCard.innerHTML = `
+    <div class="result-question">
+      <h3>Leaderboard</h3>
+      <p class="muted">${board.answeredQuestions} of ${board.totalQuestions} answers are in.</p>
+      <table class="admin-table"><thead><tr><th>#</th><th>Name</th><th>Correct</th><th>Winnings</th></tr></thead>
+      <tbody>${rows}</tbody></table>
+    </div>
+  `;
+}
+
+function renderResults() {
+  const data = state.results;
+  if (!data) return;
 
   el.resultMeta.textContent = `${data.totalSubmissions} total submission(s).`;
   el.resultsContainer.innerHTML = "";
 
+  renderLeaderboard();
   renderMyGuesses();
   renderResultsSquares();
 
@@ -524,10 +687,105 @@ async function loadResults() {
     section.innerHTML = `<h3>${question.id}. ${question.text}</h3>`;
     if (question.type === "numeric") renderNumeric(question, section);
     else renderMultipleChoice(question, section);
+    renderQuestionEntries(question, section);
     el.resultsContainer.appendChild(section);
   });
 }
 
+function applySubmissionEvent(event) {
+  const { submissionId, person, answers, squares } = event;
+
+  // Only counts are kept up to date here; expanded entry lists pick new entries up on "Show more".
+  let rescale = false;
+  if (state.results && submissionId > (state.results.lastSubmissionId || 0)) {
+    state.results.lastSubmissionId = submissionId;
+    state.results.totalSubmissions += 1;
+    state.results.questions.forEach((question) => {
+      const answer = answers[String(question.id)];
+      if (answer === undefined) return;
+      question.count += 1;
+      if (question.type === "numeric") {
+        const value = Number(answer);
+        const bin = question.bins.find((b) => value >= b.from && value <= b.to);
+        if (bin) bin.count += 1;
+        else rescale = true;
+      } else {
+        const bar = question.bars.find((b) => b.option === answer);
+        if (bar) bar.count += 1;
+      }
+    });
+  }
+
+  (squares || []).forEach((sq) => {
+    [state.squaresPublic, state.squaresRevealed].forEach((board) => {
+      if (board && !board.taken.some((t) => keyForSquare(t) === keyForSquare(sq))) board.taken.push({ ...sq, ...person });
+    });
+  });
+
+  const view = activeViewName();
+  // A guess past the end of the scale changes every bin, so fetch them again.
+  if (view === "results" && rescale) loadResults();
+  else if (view === "results") renderResults();
+  if (view === "survey" && squares && squares.length) {
+    const takenKeys = new Set(squares.map(keyForSquare));
+    state.squareSelections = state.squareSelections.filter((sq) => !takenKeys.has(keyForSquare(sq)));
+    renderSurveySquares();
+    renderSquaresSummary();
+    updateTally();
+  }
+}
+
+async function refreshAdminPayouts() {
+  if (activeViewName() !== "admin" || !state.adminPassword) return;
+  renderAdminPayoutTables(await adminFetchSummary());
+  await loadAdminLedger();
+}
+
+function connectStream() {
+  if (!window.EventSource || state.stream) return;
+  const stream = new EventSource(`${API_BASE}/stream`);
+  stream.addEventListener("submission", (e) => {
+    applySubmissionEvent(JSON.parse(e.data));
+    refreshAdminPayouts();
+  });
+  // "refresh" means another server process or a command-line import changed the data.
+  const reloadViews = async () => {
+    const view = activeViewName();
+    if (view === "results") await loadResults();
+    if (view === "survey") {
+      await loadSquaresPublic();
+      renderSurveySquares();
+      renderSquaresSummary();
+      updateTally();
+    }
+    refreshAdminPayouts();
+  };
+  stream.addEventListener("import", reloadViews);
+  stream.addEventListener("refresh", reloadViews);
+  stream.addEventListener("holds", (e) => {
+    if (!state.squaresPublic) return;
+    state.squaresPublic.held = JSON.parse(e.data).held;
+    if (activeViewName() === "survey") renderSurveySquares();
+  });
+  stream.addEventListener("questions", async () => {
+    const qRes = await fetch(`${API_BASE}/questions`);
+    state.questions = (await qRes.json()).questions;
+    state.resultDetails = {};
+    renderQuestions();
+    updateTally();
+    if (activeViewName() === "results") await loadResults();
+  });
+  stream.addEventListener("correct-answers", () => {
+    loadLeaderboard();
+    refreshAdminPayouts();
+  });
+  stream.addEventListener("scores", () => {
+    loadLeaderboard();
+    refreshAdminPayouts();
+  });
+  state.stream = stream;
+}
+
 function renderSummary() {
   const { answeredCount, squaresCount, total } = getSummary();
   el.summaryStats.innerHTML = [
@@ -537,12 +795,45 @@ function renderSummary() {
   ].join("");
 }
 
-async function adminFetchState() {
-  const res = await fetch("/api/admin/state", { headers: { "X-Admin-Password": state.adminPassword } });
+async function adminFetchSummary() {
+  const res = await fetch(`${API_BASE}/admin/summary`, { headers: { "X-Admin-Password": state.adminPassword } });
   if (!res.ok) throw new Error("Admin auth failed.");
   return res.json();
 }
 
+async function loadAdminLedger() {
+  const { sort, order, q, offset } = state.adminLedger;
+  const params = new URLSearchParams({ sort, order, offset: String(offset), limit: String(ADMIN_LEDGER_PAGE_SIZE) });
+  if (q) params.set("q", q);
+  const res = await fetch(`${API_BASE}/admin/ledger?${params}`, { headers: { "X-Admin-Password": state.adminPassword } });
+  if (!res.ok) return;
+  renderAdminLedger(await res.json());
+}
+
+function renderAdminLedger(page) {
+  const personRows = page.rows
+    .map(
+      (p) => `<tr><td><span class="avatar" style="display:inline-flex;background:${p.color};vertical-align:middle;margin-right:8px;">${p.initials}</span>${p.name}</td><td>${formatDollars(p.paidIn)}</td><td>${formatDollars(p.owed)}</td><td>${formatDollars(p.net)}</td></tr>`
+    )
+    .join("");
+  const empty = state.adminLedger.q ? "Nobody by that name." : "No submissions yet.";
+
+  el.adminByPerson.innerHTML = `
+    <table class="admin-table"><thead><tr><th>Name</th><th>Paid In</th><th>Owed</th><th>Net</th></tr></thead>
+    <tbody>${personRows || `<tr><td colspan="4">${empty}</td></tr>`}</tbody></table>
+  `;
+
+  const last = page.offset + page.rows.length;
+  el.adminLedgerPage.textContent = page.total ? `${page.offset + 1}-${last} of ${page.total}` : "";
+  el.adminLedgerPrev.disabled = page.offset === 0;
+  el.adminLedgerNext.disabled = last >= page.total;
+}
+
+function setAdminLedger(changes) {
+  Object.assign(state.adminLedger, changes);
+  loadAdminLedger();
+}
+
 function renderAdminAnswerInputs(correctAnswers = {}) {
   el.adminAnswersContainer.innerHTML = "";
   state.questions.forEach((q) => {
@@ -636,21 +927,14 @@ function renderAdminPayoutTables(payload) {
     statsTile("House remainder", formatDollars(payload.houseRemainder)),
   ].join("");
 
-  const personRows = payload.byPerson
-    .map(
-      (p) => `<tr><td><span class="avatar" style="display:inline-flex;background:${p.color};vertical-align:middle;margin-right:8px;">${p.initials}</span>${p.name}</td><td>${formatDollars(p.paidIn)}</td><td>${formatDollars(p.owed)}</td><td>${formatDollars(p.net)}</td></tr>`
-    )
-    .join("");
-
-  el.adminByPerson.innerHTML = `
-    <h3>By Person</h3>
-    <table class="admin-table"><thead><tr><th>Name</th><th>Paid In</th><th>Owed</th><th>Net</th></tr></thead>
-    <tbody>${personRows || `<tr><td colspan="4">No submissions yet.</td></tr>`}</tbody></table>
-  `;
-
+  // Long winner lists arrive as the first few names plus a count.
+  const winnerNames = (q) => {
+    const more = q.winnerCount - q.winners.length;
+    return q.winners.join(", ") + (more > 0 ? ` and ${more} more` : "");
+  };
   const questionRows = payload.questionBreakdown
     .map(
-      (q) => `<tr><td>${q.questionId}</td><td>${q.correctAnswer || "-"}</td><td>${formatDollars(q.collected)}</td><td>${q.winners.join(", ") || "None"}</td><td>${formatDollars(q.splitAmount)}</td></tr>`
+      (q) => `<tr><td>${q.questionId}</td><td>${q.correctAnswer || "-"}</td><td>${formatDollars(q.collected)}</td><td>${winnerNames(q) || "None"}</td><td>${formatDollars(q.splitAmount)}</td></tr>`
     )
     .join("");
 
@@ -664,9 +948,59 @@ function renderAdminPayoutTables(payload) {
 }
 
 async function loadAdminState() {
-  const payload = await adminFetchState();
+  const payload = await adminFetchSummary();
   renderAdminAnswerInputs(payload.correctAnswers || {});
   renderAdminPayoutTables(payload);
+  await loadAdminLedger();
+}
+
+async function downloadExport(kind) {
+  const res = await fetch(`${API_BASE}/admin/export/${kind}?format=csv`, { headers: { "X-Admin-Password": state.adminPassword } });
+  if (!res.ok) {
+    alert("Export failed.");
+    return;
+  }
+  const url = URL.createObjectURL(await res.blob());
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = `${POOL_ID || "superbowl"}-${kind}.csv`;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+}
+
+async function previewWhatIf() {
+  const answers = {};
+  document.querySelectorAll("[data-admin-qid]").forEach((node) => {
+    if (String(node.value).trim() !== "") answers[node.dataset.adminQid] = node.value;
+  });
+  if (!Object.keys(answers).length) {
+    el.adminWhatIf.innerHTML = `<p class="muted">Enter a value above to preview its winners.</p>`;
+    return;
+  }
+
+  const res = await fetch(`${API_BASE}/admin/what-if`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "X-Admin-Password": state.adminPassword },
+    body: JSON.stringify({ answers }),
+  });
+  const payload = await res.json();
+  if (!res.ok) {
+    alert(payload.error || "Could not preview winners.");
+    return;
+  }
+
+  const rows = payload.questions
+    .map(
+      (q) => `<tr><td>${q.questionId}</td><td>${q.answer}</td><td>${q.closestValues ? q.closestValues.join(" / ") : "-"}</td><td>${q.winners.join(", ") || "None"}</td><td>${formatDollars(q.splitAmount)}</td></tr>`
+    )
+    .join("");
+  el.adminWhatIf.innerHTML = `
+    <h3>What If (not saved)</h3>
+    <table class="admin-table"><thead><tr><th>Q</th><th>If correct</th><th>Closest guess</th><th>Winner(s)</th><th>Each gets</th></tr></thead>
+    <tbody>${rows}</tbody></table>
+  `;
 }
 
 async function saveCorrectAnswers() {
@@ -675,7 +1009,7 @@ async function saveCorrectAnswers() {
     answers[node.dataset.adminQid] = node.value;
   });
 
-  const res = await fetch("/api/admin/correct-answers", {
+  const res = await fetch(`${API_BASE}/admin/correct-answers`, {
     method: "POST",
     headers: { "Content-Type": "application/json", "X-Admin-Password": state.adminPassword },
     body: JSON.stringify({ answers }),
@@ -687,6 +1021,7 @@ async function saveCorrectAnswers() {
     return;
   }
   renderAdminPayoutTables(payload);
+  loadAdminLedger();
 }
 
 async function saveSquareScores() {
@@ -706,7 +1041,7 @@ async function saveSquareScores() {
     }
   }
 
-  const res = await fetch("/api/admin/squares-scores", {
+  const res = await fetch(`${API_BASE}/admin/squares-scores`, {
     method: "POST",
     headers: { "Content-Type": "application/json", "X-Admin-Password": state.adminPassword },
     body: JSON.stringify({ scores }),
@@ -718,6 +1053,7 @@ async function saveSquareScores() {
     return;
   }
   renderAdminPayoutTables(payload);
+  loadAdminLedger();
 }
 
 async function lookupSubmissionByLast4() {
@@ -728,7 +1064,7 @@ async function lookupSubmissionByLast4() {
     return;
   }
 
-  const res = await fetch("/api/view-guesses", {
+  const res = await fetch(`${API_BASE}/view-guesses`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
     body: JSON.stringify({ last4 }),
@@ -796,7 +1132,7 @@ function wireEvents() {
 
   document.getElementById("adminLoginBtn").addEventListener("click", async () => {
     const password = document.getElementById("adminPassword").value;
-    const res = await fetch("/api/admin/login", {
+    const res = await fetch(`${API_BASE}/admin/login`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ password }),
@@ -817,15 +1153,39 @@ function wireEvents() {
 
   document.getElementById("saveAnswersBtn").addEventListener("click", saveCorrectAnswers);
   document.getElementById("calcPayoutBtn").addEventListener("click", loadAdminState);
+  document.getElementById("whatIfBtn").addEventListener("click", previewWhatIf);
   document.getElementById("saveSquareScoresBtn").addEventListener("click", saveSquareScores);
+  let searchTimer = null;
+  el.adminLedgerSearch.addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => setAdminLedger({ q: el.adminLedgerSearch.value.trim(), offset: 0 }), 250);
+  });
+  el.adminLedgerSort.addEventListener("change", () => setAdminLedger({ sort: el.adminLedgerSort.value, offset: 0 }));
+  el.adminLedgerOrder.addEventListener("change", () => setAdminLedger({ order: el.adminLedgerOrder.value, offset: 0 }));
+  el.adminLedgerPrev.addEventListener("click", () =>
+    setAdminLedger({ offset: Math.max(0, state.adminLedger.offset - ADMIN_LEDGER_PAGE_SIZE) })
+  );
+  el.adminLedgerNext.addEventListener("click", () => setAdminLedger({ offset: state.adminLedger.offset + ADMIN_LEDGER_PAGE_SIZE }));
+  document.querySelectorAll("[data-export]").forEach((btn) => {
+    btn.addEventListener("click", () => downloadExport(btn.dataset.export));
+  });
 }
 
 async function init() {
-  const qRes = await fetch("/api/questions");
-  state.questions = (await qRes.json()).questions;
+  const qRes = await fetch(`${API_BASE}/questions`);
+  const qData = await qRes.json();
+  state.questions = qData.questions;
+  if (POOL_ID && qData.pool) {
+    document.title = `${qData.pool.name} Betting Board`;
+    document.querySelector("h1").textContent = `${qData.pool.name} Betting Board`;
+  }
 
   restoreDraft();
   await loadSquaresPublic();
+  if (state.squareSelections.length && !(await holdSquares(state.squareSelections))) {
+    state.squareSelections = [];
+    saveDraft();
+  }
 
   renderQuestions();
   renderSurveySquares();
@@ -834,6 +1194,8 @@ async function init() {
 
   wireDraftEvents();
   wireEvents();
+  connectStream();
+  keepHoldsAlive();
 }
 
 init();